@@ -0,0 +1,126 @@
+# -*- python -*-
+
+# pylogsparser - Logs parsers python library
+#
+# Copyright (C) 2011 Wallix Inc.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+#
+
+"""
+Compiled bundles of normalizers.
+
+Loading normalizers from their XML definitions means parsing and validating
+the files, compiling the callbacks and, above all, compiling the regular
+expressions. A bundle saves the loaded normalizers in a single pickle, the
+regular expressions being stored in their compiled form, so that they can be
+loaded back without any of this work.
+
+A bundle is only valid for the exact definition files it was built from, and
+for the python version that built it.
+"""
+
+import os
+import sys
+import hashlib
+import warnings
+import cPickle
+import _sre
+import sre_parse
+import sre_compile
+
+BUNDLE_VERSION = 1
+
+# compiled regular expressions
+_pattern_type = type(sre_compile.compile("", 0))
+
+def get_bundle_key(paths):
+    """computes the key of the bundle built from a list of files.
+
+    @param paths: the paths of the definition files, in loading order
+    @return: a string identifying the files' contents, the bundle format and
+    the python version."""
+    key = hashlib.sha1()
+    key.update("%s|%s|%s" % (BUNDLE_VERSION, sys.version, _sre.MAGIC))
+    for path in paths:
+        key.update("|%s|" % path)
+        key.update(hashlib.sha1(open(path, 'rb').read()).digest())
+    return key.hexdigest()
+
+def _persistent_id(obj):
+    """stores compiled regular expressions as their compiled code."""
+    if type(obj) is not _pattern_type:
+        return None
+    p = sre_parse.parse(obj.pattern, obj.flags)
+    return ('re', obj.pattern, obj.flags, sre_compile._code(p, obj.flags),
+            obj.groups, obj.groupindex)
+
+def _persistent_load(pid):
+    tag, pattern, flags, code, groups, groupindex = pid
+    if tag != 're':
+        raise cPickle.UnpicklingError, "Unknown persistent id %r" % tag
+    indexgroup = [None] * (groups + 1)
+    for name, index in groupindex.items():
+        indexgroup[index] = name
+    return _sre.compile(pattern, flags, code, groups, groupindex, indexgroup)
+
+def dump_bundle(path, key, content):
+    """writes a bundle. Errors are reported as warnings, a bundle being nothing
+    more than a cache.
+
+    @param path: the path of the bundle file
+    @param key: the bundle key, as returned by get_bundle_key
+    @param content: the objects to save
+    @return: True if the bundle was written."""
+    tmp_path = "%s.%s.tmp" % (path, os.getpid())
+    try:
+        f = open(tmp_path, 'wb')
+        try:
+            pickler = cPickle.Pickler(f, cPickle.HIGHEST_PROTOCOL)
+            pickler.persistent_id = _persistent_id
+            pickler.dump(key)
+            pickler.dump(content)
+        finally:
+            f.close()
+        # never let a reader see a partial bundle
+        os.rename(tmp_path, path)
+        return True
+    except Exception, e:
+        warnings.warn("Could not write the normalizers bundle %s : %s" % (path, e))
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        return False
+
+def load_bundle(path, key):
+    """reads a bundle.
+
+    @param path: the path of the bundle file
+    @param key: the expected bundle key, as returned by get_bundle_key
+    @return: the saved objects, or None if there is no valid bundle at path."""
+    if not os.path.isfile(path):
+        return None
+    try:
+        f = open(path, 'rb')
+        try:
+            unpickler = cPickle.Unpickler(f)
+            unpickler.persistent_load = _persistent_load
+            if unpickler.load() != key:
+                return None
+            return unpickler.load()
+        finally:
+            f.close()
+    except Exception, e:
+        warnings.warn("Could not read the normalizers bundle %s : %s" % (path, e))
+        return None
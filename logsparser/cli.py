@@ -0,0 +1,259 @@
+# -*- python -*-
+
+# pylogsparser - Logs parsers python library
+#
+# Copyright (C) 2011 Wallix Inc.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+#
+
+"""The logsparser-normalize command : normalizes raw logs read from files or
+from the standard input, and writes them as JSON lines."""
+
+import os
+import sys
+import math
+import time
+import json
+from datetime import datetime, date, timedelta
+from collections import deque
+from optparse import OptionParser
+
+from lognormalizer import LogNormalizer
+from reader import open_log, read_lines
+
+usage = """%prog [options] [FILE ...]
+
+Normalizes the logs of the given files, or of the standard input if there are
+none, one log per line. Compressed files (gzip, bzip2, xz) are read
+transparently. Normalized logs are written as JSON objects, one per line.
+
+Throughput, latency (from the reading of a line to the writing of its
+normalized log) and the rate of logs matched by no normalizer are reported
+periodically on the standard error."""
+
+def get_parser():
+    parser = OptionParser(usage)
+    parser.add_option("-n", "--normalizers", dest = "normalizers",
+                      action = "append", default = [],
+                      help = "a directory of normalizers; can be repeated. Defaults "
+                             "to $NORMALIZERS_PATH, or to the installed normalizers")
+    parser.add_option("-a", "--activate", dest = "activate",
+                      action = "append", default = [],
+                      help = "apply only this normalizer, given as name or name-version; "
+                             "can be repeated")
+    parser.add_option("-d", "--deactivate", dest = "deactivate",
+                      action = "append", default = [],
+                      help = "do not apply this normalizer, given as name or name-version; "
+                             "can be repeated")
+    parser.add_option("-w", "--workers", dest = "workers", type = "int",
+                      default = 0,
+                      help = "the number of worker processes; 0 normalizes logs "
+                             "in this process [default: %default]")
+    parser.add_option("-b", "--batch-size", dest = "batch_size", type = "int",
+                      default = 256,
+                      help = "the number of logs sent to a worker at once [default: %default]")
+    parser.add_option("-o", "--output", dest = "output",
+                      help = "the file the normalized logs are written to, instead "
+                             "of the standard output")
+    parser.add_option("-e", "--encoding", dest = "encoding", default = "utf-8",
+                      help = "the encoding of the logs [default: %default]")
+    parser.add_option("-r", "--report", dest = "report", type = "float",
+                      default = 10,
+                      help = "the interval between two reports on the standard "
+                             "error, in seconds; 0 reports at the end only "
+                             "[default: %default]")
+    parser.add_option("--first-match", dest = "first_match",
+                      action = "store_true", default = False,
+                      help = "find the matching normalizers with merged regular "
+                             "expressions, in a single pass over each field")
+    parser.add_option("--bundle", dest = "bundle",
+                      action = "store_true", default = False,
+                      help = "load the normalizers from a compiled bundle, built "
+                             "if needed in the first normalizers directory")
+    return parser
+
+def get_normalizers_paths(paths):
+    """@return: the normalizers directories to use, given the ones on the
+    command line."""
+    if paths:
+        return paths
+    if os.environ.get('NORMALIZERS_PATH'):
+        return [os.environ['NORMALIZERS_PATH']]
+    return [os.path.join(sys.prefix, 'share', 'logsparser', 'normalizers')]
+
+def select_normalizers(ln, activate, deactivate):
+    """activates the normalizers of a L{LogNormalizer} according to the
+    command line. Normalizers are designated by name or by name-version.
+    @raise ValueError: if a designated normalizer does not exist"""
+    uuids = [ n.uuid for n in sum(ln.normalizers.values(), []) ]
+    def lookup(names):
+        selected = set()
+        for name in names:
+            found = [ u for u in uuids if u == name or u.rsplit('-', 1)[0] == name ]
+            if not found:
+                raise ValueError, "Unknown normalizer : %s" % name
+            selected.update(found)
+        return selected
+    active = ln.get_active_normalizers()
+    if activate:
+        selected = lookup(activate)
+        active = dict([ (u, u in selected) for u in uuids ])
+    for u in lookup(deactivate):
+        active[u] = False
+    ln.set_active_normalizers(active)
+    ln.activate_normalizers()
+
+def to_json(obj):
+    """serializes the values json does not handle."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, timedelta):
+        return obj.total_seconds()
+    return repr(obj)
+
+# latencies are counted in buckets, the upper bound of each of them being
+# LATENCY_RATIO times that of the previous one, starting at LATENCY_BASE
+# seconds : percentiles are known within 5%, whatever the number of logs, in a
+# few hundred counters.
+LATENCY_BASE = 1e-6
+LATENCY_RATIO = 1.05
+_LOG_RATIO = math.log(LATENCY_RATIO)
+
+def latency_bucket(latency):
+    """@return: the index of the bucket counting latency, in seconds."""
+    if latency <= LATENCY_BASE:
+        return 0
+    return int(math.log(latency / LATENCY_BASE) / _LOG_RATIO) + 1
+
+def percentile(histogram, count, p):
+    """@param histogram: the number of latencies by bucket index
+    @param count: the number of latencies counted in histogram
+    @return: the p-th percentile of the latencies, as the upper bound of its
+    bucket."""
+    rank = min(count - 1, int(count * p / 100.0))
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen > rank:
+            return LATENCY_BASE * LATENCY_RATIO ** bucket
+
+class Report(object):
+    """Statistics of the normalized logs, printed periodically."""
+
+    def __init__(self, out, interval):
+        """@param out: the stream the reports are written to
+        @param interval: the interval between two reports, in seconds"""
+        self.out = out
+        self.interval = interval
+        self.start = self.last = time.time()
+        self.total = 0
+        self.total_unmatched = 0
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.unmatched = 0
+        # the latencies, as a histogram : bucket index : count
+        self.latencies = {}
+
+    def add(self, log, latency):
+        self.count += 1
+        # raw and uuid are set whatever happens
+        if len(log) <= 2:
+            self.unmatched += 1
+        bucket = latency_bucket(latency)
+        self.latencies[bucket] = self.latencies.get(bucket, 0) + 1
+
+    def tick(self, now):
+        if self.interval and now - self.last >= self.interval:
+            self.write(now)
+
+    def write(self, now, final = False):
+        self.total += self.count
+        self.total_unmatched += self.unmatched
+        elapsed = (now - self.last) or 1e-6
+        line = "%i logs, %.0f logs/s" % (self.count, self.count / elapsed)
+        if self.latencies:
+            line += ", latency p50 %.2fms p90 %.2fms p99 %.2fms" % \
+                tuple([ 1000 * percentile(self.latencies, self.count, p)
+                        for p in (50, 90, 99) ])
+        if self.count:
+            line += ", %.1f%% unmatched" % (100.0 * self.unmatched / self.count)
+        if final:
+            total_elapsed = (now - self.start) or 1e-6
+            line += " | total : %i logs in %.1fs, %.0f logs/s, %.1f%% unmatched" % \
+                (self.total, total_elapsed, self.total / total_elapsed,
+                 100.0 * self.total_unmatched / (self.total or 1))
+        self.out.write(line + "\n")
+        self.out.flush()
+        self.last = now
+        self.reset()
+
+def main(argv = None):
+    """runs the logsparser-normalize command.
+    @param argv: the command line arguments, defaults to sys.argv[1:]
+    @return: the exit status"""
+    parser = get_parser()
+    options, files = parser.parse_args(argv)
+    if options.workers < 0 or options.batch_size < 1:
+        parser.error("the number of workers and the batch size must be positive")
+    try:
+        ln = LogNormalizer(get_normalizers_paths(options.normalizers),
+                           first_match = options.first_match,
+                           bundle = options.bundle)
+        select_normalizers(ln, options.activate, options.deactivate)
+    except StandardError, e:
+        sys.stderr.write("%s\n" % e)
+        return 1
+    normalizer = ln
+    if options.workers:
+        normalizer = ln.parallel(options.workers, options.batch_size)
+    out = sys.stdout
+    if options.output:
+        out = open(options.output, 'w')
+    report = Report(sys.stderr, options.report)
+    # the times the lines were read at, in order
+    read_times = deque()
+    def read_logs():
+        for source in files or ['-']:
+            f = open_log(source)
+            try:
+                for line in read_lines(f, options.encoding):
+                    if line:
+                        read_times.append(time.time())
+                        yield {'raw' : line}
+            finally:
+                f.close()
+    try:
+        for log in normalizer.normalize_batch(read_logs()):
+            # uuids are 128 bits integers, which most JSON parsers would round
+            if 'uuid' in log:
+                log['uuid'] = str(log['uuid'])
+            out.write(json.dumps(log, default = to_json))
+            out.write("\n")
+            now = time.time()
+            report.add(log, now - read_times.popleft())
+            report.tick(now)
+    except IOError, e:
+        sys.stderr.write("%s\n" % e)
+        return 1
+    finally:
+        if options.workers:
+            normalizer.close()
+        if options.output:
+            out.close()
+    report.write(time.time(), final = True)
+    return 0
@@ -21,8 +21,10 @@
 # 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
 #
 
-from domain_parser import get_domain
-from robots import robot_regex
-from timezone import to_naive_utc
-from windows import winUTC2UnixTimestamp
-from iso8601_parser import iso_to_utc
\ No newline at end of file
+from domain_parser import get_domain, load_suffix_list
+from robots import robot_regex, find_robot, load_robots
+from timezone import to_naive_utc, to_naive_utc_batch
+from windows import winUTC2UnixTimestamp, filetime_to_datetime, filetime_to_datetime_batch
+from iso8601_parser import iso_to_utc
+from date_parser import parse_date, parse_syslog_date
+from geoip import country_code_by_address, country_codes, load_country_database
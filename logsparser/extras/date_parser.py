@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+# -*- python -*-
+
+# pylogsparser - Logs parsers python library
+#
+# Copyright (C) 2011 Wallix Inc.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+#
+
+"""Parsers for the date formats found in logs, as used by the common callbacks.
+
+The regular expressions are compiled once, fixed width formats are parsed by
+slicing, and the results are cached: a busy second produces thousands of logs
+holding the very same timestamp."""
+
+import re
+import time
+from datetime import datetime, timedelta
+
+from lru import LRUCache, memoize
+from timezone import to_naive_utc
+
+MONTHS = {'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+          'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12}
+
+def _search(regexp, value):
+    """@return: the groups of the first match of regexp in value, as integers."""
+    m = regexp.search(value)
+    if m is None:
+        raise ValueError, "invalid date string %s" % value
+    return [ int(v or 0) for v in m.groups() ]
+
+MMddYYYY = re.compile(r'(\d{2})/(\d{2})/(\d{4}) (\d{2}):(\d{2}):(\d{2})')
+
+@memoize()
+def parse_MMddYYYY(value):
+    """parses dates such as 12/21/2012 23:54:42"""
+    month, day, year, hour, minute, second = _search(MMddYYYY, value)
+    return datetime(year, month, day, hour, minute, second)
+
+ddMMMYYYY = re.compile(r'(\d+)/([a-zA-Z]+)/(\d+):(\d+):(\d+):(\d+)')
+
+@memoize()
+def parse_ddMMMYYYY(value):
+    """parses dates such as 21/Dec/2012:23:54:42"""
+    m = ddMMMYYYY.search(value)
+    if m is None:
+        raise ValueError, "invalid date string %s" % value
+    day, month, year, hour, minute, second = m.groups()
+    return datetime(int(year), MONTHS[month], int(day),
+                    int(hour), int(minute), int(second))
+
+@memoize()
+def parse_MMMddYYYY(value):
+    """parses dates such as Dec 21 2012 23:54:42"""
+    return datetime(int(value[7:11]),
+                    MONTHS[value[0:3]],
+                    int(value[4:6]),
+                    int(value[12:14]),
+                    int(value[15:17]),
+                    int(value[18:20]))
+
+DDDMMMddYYYY = re.compile(u'([A-Z]{1}[a-z]{2}) (\d{1,2}) (\d{2}):(\d{2}):(\d{2}) (\d{4})')
+
+@memoize()
+def parse_DDDMMMddYYYY(value):
+    """parses dates such as Fri Dec 21 23:54:42 2012"""
+    m = DDDMMMddYYYY.search(value)
+    if m is None:
+        raise ValueError, "invalid date string %s" % value
+    month, day, hour, minute, second, year = m.groups()
+    return datetime(int(year), MONTHS[month], int(day),
+                    int(hour), int(minute), int(second))
+
+YYYYMMDD = re.compile(r'(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2})')
+
+@memoize()
+def parse_YYYYMMDD(value):
+    """parses dates such as 2012-12-21 23:54:42"""
+    return datetime(*_search(YYYYMMDD, value))
+
+MMDDYY = re.compile(r'(\d{2})/(\d{2})/(\d{2}), (\d{1,2}):(\d{2}):(\d{2})')
+
+@memoize()
+def parse_MMDDYY(value):
+    """parses dates such as 12/21/12, 23:54:42. The year is set in the XXIst
+    century."""
+    month, day, year, hour, minute, second = _search(MMDDYY, value)
+    return datetime(2000 + year, month, day, hour, minute, second)
+
+YYMMDD = re.compile(r'([0-9]{2})([0-9]{2})([0-9]{2}) ((?:[0-9]{2}| [0-9])):([0-9]{2}):([0-9]{2})')
+
+@memoize()
+def parse_YYMMDD(value):
+    """parses dates such as 121221 23:54:42. The year is set in the XXIst
+    century."""
+    year, month, day, hour, minute, second = _search(YYMMDD, value)
+    return datetime(2000 + year, month, day, hour, minute, second)
+
+ZULU = re.compile(r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(?:(\d{2})(?:\.(\d{3}))?)?Z')
+
+@memoize()
+def parse_ISO8601(value):
+    """parses UTC dates such as 2012-12-21T23:54:42.123Z"""
+    m = ZULU.match(value)
+    if m is None:
+        raise ValueError, "invalid date string %s" % value
+    year, month, day, hour, minute, second, millisecond = [ int(v or 0) for v in m.groups() ]
+    return datetime(year, month, day, hour, minute, second, millisecond * 1000)
+
+@memoize()
+def parse_EPOCH(value):
+    """parses EPOCH timestamps such as 1356134082.123"""
+    return datetime.utcfromtimestamp(float(value))
+
+ddMMMYYYYhhmmss = re.compile(r'(\d+)-(\w+)-(\d{4}) (\d+):(\d+):(\d+)(?:\.(\d+))?')
+
+@memoize()
+def parse_dd_MMM_YYYY(value):
+    """parses dates such as 21-Dec-2012 23:54:42.123"""
+    m = ddMMMYYYYhhmmss.match(value)
+    if m is None:
+        raise ValueError, "invalid date string %s" % value
+    day, month, year, hour, minute, second, millisecond = m.groups()
+    return datetime(int(year), MONTHS[month], int(day), int(hour), int(minute),
+                    int(second), int(millisecond or 0) * 1000)
+
+# the parsers, by callback name
+PARSERS = { "MM/dd/YYYY hh:mm:ss" : parse_MMddYYYY,
+            "dd/MMM/YYYY:hh:mm:ss" : parse_ddMMMYYYY,
+            "MMM dd YYYY hh:mm:ss" : parse_MMMddYYYY,
+            "DDD MMM dd hh:mm:ss YYYY" : parse_DDDMMMddYYYY,
+            "YYYY-MM-DD hh:mm:ss" : parse_YYYYMMDD,
+            "MM/DD/YY, hh:mm:ss" : parse_MMDDYY,
+            "YYMMDD hh:mm:ss" : parse_YYMMDD,
+            "ISO8601" : parse_ISO8601,
+            "EPOCH" : parse_EPOCH,
+            "dd-MMM-YYYY hh:mm:ss" : parse_dd_MMM_YYYY }
+
+def parse_date(date_format, value):
+    """parses a date.
+    @param date_format: the name of the date format, as in PARSERS
+    @param value: the date string
+    @return: a naive datetime"""
+    return PARSERS[date_format](value)
+
+# the year of syslog dates depends on the current date, so they are only
+# cached for a second.
+SYSLOG_DATE_TTL = 1
+_syslog_dates = LRUCache(10000)
+
+def parse_syslog_date(value, timezone = None):
+    """parses syslog dates such as Dec 21 23:54:42. The year is the current
+    one, unless this would set the date more than a minute in the future.
+    @param value: the date string
+    @param timezone: the eventual timezone of the date, used to compare the
+    date with the current one
+    @return: a naive datetime"""
+    now = time.time()
+    key = (value, timezone)
+    cached = _syslog_dates.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    current = datetime.now()
+    # Following line may throw a lot of ValueError
+    newdate = datetime(current.year,
+                       MONTHS[value[0:3]],
+                       int(value[4:6]),
+                       int(value[7:9]),
+                       int(value[10:12]),
+                       int(value[13:15]))
+    test_date = newdate
+    if timezone is not None:
+        test_date = to_naive_utc(newdate, timezone)
+        current = datetime.utcnow()
+    # give it a minute of latency
+    if test_date > current + timedelta(minutes=+1):
+        newdate = newdate.replace(year = newdate.year - 1)
+    _syslog_dates[key] = (now + SYSLOG_DATE_TTL, newdate)
+    return newdate
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+# -*- python -*-
+
+# pylogsparser - Logs parsers python library
+#
+# Copyright (C) 2011 Wallix Inc.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+#
+
+"""Country lookups of IP addresses.
+
+Lookups are made by the GeoIP module if it is installed, or in a CSV file of
+IPv4 ranges loaded with load_country_database. Results are cached by address."""
+
+import csv
+import socket
+import struct
+from bisect import bisect_right
+from threading import Lock
+
+from lru import memoize
+
+def ip_to_int(address):
+    """@return: the IPv4 address as an integer, or None if it is not one."""
+    try:
+        return struct.unpack('!I', socket.inet_aton(address))[0]
+    except (socket.error, TypeError, UnicodeError):
+        return None
+
+class RangeDatabase(object):
+    """A country database made of sorted IPv4 ranges, searched by bisection.
+
+    The CSV file holds one range per row, either as in MaxMind's GeoIP
+    country CSV file :
+
+        "1.0.0.0","1.0.0.255","16777216","16777471","AU","Australia"
+
+    or as three columns, the first and last addresses and the country code :
+
+        1.0.0.0,1.0.0.255,AU
+    """
+
+    def __init__(self, path):
+        """@param path: the path of the CSV file"""
+        ranges = []
+        for row in csv.reader(open(path, 'rb')):
+            if len(row) >= 5:
+                start, end, code = int(row[2]), int(row[3]), row[4]
+            elif len(row) == 3:
+                start, end, code = ip_to_int(row[0]), ip_to_int(row[1]), row[2]
+            else:
+                # blank or comment line
+                continue
+            if start is None or end is None:
+                raise ValueError, "invalid range %r in %s" % (row, path)
+            ranges.append((start, end, code))
+        ranges.sort()
+        self.starts = [ r[0] for r in ranges ]
+        self.ends = [ r[1] for r in ranges ]
+        self.codes = [ r[2] for r in ranges ]
+
+    def country_code_by_addr(self, address):
+        """@return: the country code of address, or None if it is not in a
+        range of the database."""
+        ip = ip_to_int(address)
+        if ip is None:
+            return None
+        i = bisect_right(self.starts, ip) - 1
+        if i >= 0 and ip <= self.ends[i]:
+            return self.codes[i]
+        return None
+
+_lookup = None
+_lookup_lock = Lock()
+
+def _no_lookup(address):
+    return None
+
+def _get_lookup():
+    """@return: the lookup function of the database, GeoIP's by default."""
+    global _lookup
+    _lookup_lock.acquire()
+    try:
+        if _lookup is None:
+            try:
+                import GeoIP
+                _lookup = GeoIP.new(GeoIP.GEOIP_MEMORY_CACHE).country_code_by_addr
+            except ImportError:
+                _lookup = _no_lookup
+        return _lookup
+    finally:
+        _lookup_lock.release()
+
+def load_country_database(path = None):
+    """sets the database used by country_code_by_address.
+    @param path: the path of a CSV file of ranges, as read by RangeDatabase. If
+    None, the GeoIP module is used if available."""
+    global _lookup
+    lookup = None
+    if path is not None:
+        lookup = RangeDatabase(path).country_code_by_addr
+    _lookup_lock.acquire()
+    try:
+        _lookup = lookup
+        country_code_by_address.cache.clear()
+    finally:
+        _lookup_lock.release()
+
+@memoize()
+def country_code_by_address(address):
+    """@param address: an IP address
+    @return: the code of the country of address, or None if unknown"""
+    return (_lookup or _get_lookup())(address)
+
+def country_codes(addresses):
+    """looks up the countries of many addresses at once.
+    @param addresses: an iterable of IP addresses
+    @return: the list of the addresses' country codes"""
+    codes = {}
+    result = []
+    for address in addresses:
+        code = codes.get(address, codes)
+        if code is codes:
+            code = codes[address] = country_code_by_address(address)
+        result.append(code)
+    return result
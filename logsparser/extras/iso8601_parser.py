@@ -21,13 +21,47 @@
 # 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
 #
 
-""""""
+"""A strict ISO 8601 / RFC 3339 date parser. Dates not following the
+usual layout are handed over to dateutil."""
 
-import dateutil.parser as dp
+import re
+from datetime import datetime, timedelta
 
+from lru import memoize
+
+ISO8601 = re.compile(r"""(\d{4})-(\d{2})-(\d{2})
+                         (?:[Tt ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d+))?)?)?
+                         (?:([Zz])|([+-])(\d{2})(?::?(\d{2}))?)?$""", re.VERBOSE)
+
+def _dateutil_parse(date):
+    """parses date with dateutil, a slow but very tolerant parser.
+    @return: naive datetime set to UTC"""
+    import dateutil.parser as dp
+    parsed = dp.parse(date)
+    if parsed.tzinfo is not None:
+        parsed = (parsed - parsed.utcoffset()).replace(tzinfo = None)
+    return parsed
+
+@memoize()
 def iso_to_utc(date):
     """
     @param date: an str datetime instance
     @return: naive datetime set to UTC
     """
-    return dp.parse(date)
\ No newline at end of file
+    m = ISO8601.match(date)
+    if m is None:
+        return _dateutil_parse(date)
+    year, month, day, hour, minute, second, fraction, zulu, sign, off_hour, off_minute = m.groups()
+    try:
+        parsed = datetime(int(year), int(month), int(day),
+                          int(hour or 0), int(minute or 0), int(second or 0),
+                          fraction and int(fraction[:6].ljust(6, '0')) or 0)
+    except ValueError:
+        return _dateutil_parse(date)
+    if sign:
+        offset = timedelta(hours = int(off_hour), minutes = int(off_minute or 0))
+        if sign == '+':
+            parsed -= offset
+        else:
+            parsed += offset
+    return parsed
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+# -*- python -*-
+
+# pylogsparser - Logs parsers python library
+#
+# Copyright (C) 2011 Wallix Inc.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+#
+
+"""A bounded, thread-safe cache of the most recently used values."""
+
+from threading import Lock
+
+# positions in the links of the recency list
+PREV, NEXT, KEY, VALUE, USED = 0, 1, 2, 3, 4
+
+class LRUCache(object):
+    """A dictionary-like cache holding at most maxsize entries. When full, an
+    entry that was not used recently is evicted.
+
+    Lookups take no lock : they only flag the entry they find as used. Entries
+    are kept in a circular doubly linked list, in order of insertion, which is
+    only changed under the lock, when inserting. To make room, the oldest
+    entries that were used since they were last checked are moved to the
+    newest end of the list and unflagged, and the first unused one is
+    evicted ("second chance"). Every operation is O(1) on average. The hits
+    and misses counters are not locked either, and may miss a few updates
+    when threads race."""
+
+    def __init__(self, maxsize = 10000):
+        """@param maxsize: the maximum number of entries in the cache"""
+        self.maxsize = maxsize
+        self.lock = Lock()
+        self.clear()
+
+    def clear(self):
+        """empties the cache."""
+        self.lock.acquire()
+        try:
+            self.map = {}
+            self.root = root = []
+            root[:] = [root, root, None, None, False]
+            self.hits = self.misses = 0
+        finally:
+            self.lock.release()
+
+    def get(self, key, default = None):
+        """@return: the value cached for key, or default if there is none."""
+        link = self.map.get(key)
+        if link is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        link[USED] = True
+        return link[VALUE]
+
+    def _evict(self):
+        """removes an entry that was not used recently. Must be called with
+        the lock held."""
+        root = self.root
+        while True:
+            oldest = root[NEXT]
+            # unlink it
+            root[NEXT] = oldest[NEXT]
+            oldest[NEXT][PREV] = root
+            if not oldest[USED]:
+                del self.map[oldest[KEY]]
+                return
+            # second chance : append it back as the newest entry
+            oldest[USED] = False
+            last = root[PREV]
+            oldest[PREV] = last
+            oldest[NEXT] = root
+            last[NEXT] = root[PREV] = oldest
+
+    def __setitem__(self, key, value):
+        self.lock.acquire()
+        try:
+            link = self.map.get(key)
+            if link is not None:
+                link[VALUE] = value
+                return
+            if len(self.map) >= self.maxsize:
+                self._evict()
+            root = self.root
+            last = root[PREV]
+            link = [last, root, key, value, False]
+            last[NEXT] = root[PREV] = self.map[key] = link
+        finally:
+            self.lock.release()
+
+    def __getitem__(self, key):
+        value = self.get(key, self)
+        if value is self:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return key in self.map
+
+    def __len__(self):
+        return len(self.map)
+
+def memoize(maxsize = 10000):
+    """decorates a function of a single hashable argument so that its results
+    are kept in a L{LRUCache}. The cache is available as the cache attribute of
+    the decorated function."""
+    def decorator(function):
+        cache = LRUCache(maxsize)
+        def memoized(value):
+            result = cache.get(value, cache)
+            if result is cache:
+                result = function(value)
+                cache[value] = result
+            return result
+        memoized.cache = cache
+        memoized.__name__ = function.__name__
+        memoized.__doc__ = function.__doc__
+        return memoized
+    return decorator
@@ -22,9 +22,14 @@
 #
 
 """In this module we define a regular expression used to fetch the most common
-robots."""
+robots, and a cached classifier of user agents built upon a faster version
+of it."""
 
 import re
+import sys
+from threading import Lock
+
+from lru import memoize
 
 # taken from genrobotlist.pl in the awstats project : http://awstats.cvs.sourceforge.net
 robots = [
@@ -103,3 +108,82 @@ robots = [
     'zyborg',
 ]
 robot_regex = re.compile("|".join(robots), re.IGNORECASE)
+
+def _trie_pattern(node):
+    """@param node: a trie node, mapping characters to nodes. The empty string
+    key marks the end of a word.
+    @return: a regular expression matching the words of the trie"""
+    branches = [ re.escape(c) + _trie_pattern(child)
+                 for c, child in sorted(node.items()) if c ]
+    if not branches:
+        return ''
+    if len(branches) == 1:
+        body = branches[0]
+    else:
+        body = '(?:%s)' % '|'.join(branches)
+    if '' in node:
+        return '(?:%s)?' % body
+    return body
+
+def compile_robots(names):
+    """compiles robot names into a single regular expression. The names are
+    factored into a trie, so that the regular expression engine never tries
+    more than one name per character, whatever the number of robots. It is
+    meant to be applied to lowercased strings, and returns the leftmost,
+    longest robot name.
+    @param names: the robot names
+    @return: a compiled regular expression"""
+    trie = {}
+    for name in names:
+        node = trie
+        for c in name.lower():
+            node = node.setdefault(c, {})
+        node[''] = True
+    return re.compile(_trie_pattern(trie) or '(?!)')
+
+_robots_lock = Lock()
+_matcher = compile_robots(robots)
+
+def read_robots(path):
+    """reads a list of robots, one name per line. Empty lines and lines
+    starting with # are ignored.
+    @param path: the path of the list
+    @return: the robot names"""
+    names = []
+    for line in open(path):
+        line = line.strip()
+        if line and not line.startswith('#'):
+            names.append(line)
+    return names
+
+def load_robots(path, extend = True):
+    """loads a list of robots into the classifier used by find_robot.
+    @param path: the path of the list, as read by read_robots
+    @param extend: if True, the robots of the list are added to the known ones.
+    Otherwise they replace them. robot_regex is rebuilt as well."""
+    global _matcher, robot_regex
+    _robots_lock.acquire()
+    try:
+        names = read_robots(path)
+        if extend:
+            names = robots + [ n for n in names if n not in robots ]
+        robots[:] = names
+        _matcher = compile_robots(robots)
+        robot_regex = re.compile("|".join([ re.escape(n) for n in robots ]) or '(?!)',
+                                 re.IGNORECASE)
+        # the package re-exports robot_regex, keep its binding current too
+        package = sys.modules.get(__name__.rpartition('.')[0])
+        if getattr(package, 'robot_regex', None) is not None:
+            package.robot_regex = robot_regex
+        find_robot.cache.clear()
+    finally:
+        _robots_lock.release()
+
+@memoize()
+def find_robot(useragent):
+    """@param useragent: a user agent string
+    @return: the lowercased name of the robot found in useragent, or None"""
+    m = _matcher.search(useragent.lower())
+    if m:
+        return m.group()
+    return None
@@ -23,7 +23,43 @@
 
 """"""
 
-import pytz
+from datetime import timedelta
+
+from lru import LRUCache
+
+_timezones = {}
+# UTC offsets, by (timezone name, hour)
+_offsets = LRUCache(10000)
+ONE_HOUR = timedelta(hours = 1)
+LAST_MICROSECOND = timedelta(hours = 1, microseconds = -1)
+
+def get_timezone(name):
+    """@return: the pytz timezone called name, UTC if there is none."""
+    timezone = _timezones.get(name)
+    if timezone is None:
+        # pytz is only needed by logs carrying a timezone
+        import pytz
+        try:
+            timezone = pytz.timezone(name)
+        except pytz.UnknownTimeZoneError:
+            timezone = pytz.utc
+        _timezones[name] = timezone
+    return timezone
+
+def _get_offset(date, from_tz):
+    """@return: the UTC offset of the naive datetime date in timezone from_tz.
+    Offsets are cached by hour, unless a DST transition occurs within the hour."""
+    key = (from_tz, date.toordinal(), date.hour)
+    offset = _offsets.get(key)
+    if offset is None:
+        timezone = get_timezone(from_tz)
+        start = date.replace(minute = 0, second = 0, microsecond = 0)
+        offset = timezone.localize(start).utcoffset()
+        if timezone.localize(start + LAST_MICROSECOND).utcoffset() != offset:
+            # a transition occurs within this hour, do not cache
+            return timezone.localize(date).utcoffset()
+        _offsets[key] = offset
+    return offset
 
 def to_naive_utc(date, from_tz):
     """
@@ -32,9 +68,26 @@ def to_naive_utc(date, from_tz):
     @return: naive datetime set to UTC
     """
     date = date.replace(tzinfo=None)
-    try:
-        timezone = pytz.timezone(from_tz)
-    except pytz.UnknownTimeZoneError:
-        timezone = pytz.utc
-    loc_date = timezone.localize(date)
-    return loc_date.astimezone(pytz.utc).replace(tzinfo=None)
+    return date - _get_offset(date, from_tz)
+
+def to_naive_utc_batch(dates, from_tz):
+    """
+    @param dates: a list of naive datetime instances
+    @param from_tz: timezone information about the naive datetimes
+    @return: the list of the naive datetimes set to UTC
+    """
+    result = []
+    append = result.append
+    last_key = None
+    for date in dates:
+        date = date.replace(tzinfo=None)
+        key = (date.toordinal(), date.hour)
+        # consecutive dates mostly fall within the same hour
+        if key != last_key:
+            offset = _get_offset(date, from_tz)
+            last_key = key
+            if (from_tz,) + key not in _offsets:
+                # DST transition within this hour
+                last_key = None
+        append(date - offset)
+    return result
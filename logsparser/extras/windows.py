@@ -23,14 +23,33 @@
 
 """Windows and MS-related utility functions."""
 
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# the origin of windows timestamps
+FILETIME_EPOCH = datetime(1601, 1, 1)
 
 def winUTC2UnixTimestamp(winTimestamp):
 	"""Converts a windows UTC timestamp (increments of 100 nanoseconds since Jan 1, 1601)
 	into a Unix EPOCH timestamp.
 	
-	@param winTimestamp : the windows timestamp"""
+	@param winTimestamp : the windows timestamp
+	@return: the date in UTC, to the second, as an ISO 8601 string"""
+	
+	return filetime_to_datetime(winTimestamp).replace(microsecond = 0).isoformat()
+
+def filetime_to_datetime(filetime):
+	"""Converts a windows UTC timestamp (increments of 100 nanoseconds since Jan 1, 1601)
+	into a naive datetime set to UTC.
+	
+	@param filetime : the windows timestamp, as an integer or a string"""
+	
+	return FILETIME_EPOCH + timedelta(microseconds = int(filetime) // 10)
+
+def filetime_to_datetime_batch(filetimes):
+	"""Converts windows UTC timestamps into naive datetimes set to UTC.
+	
+	@param filetimes : an iterable of windows timestamps
+	@return: the list of datetimes"""
 	
-	a = int(winTimestamp)
-	unixts = (a / 10000000) - 11644473600
-	return datetime.fromtimestamp(unixts).isoformat()
+	epoch = FILETIME_EPOCH
+	return [ epoch + timedelta(microseconds = int(f) // 10) for f in filetimes ]
@@ -31,10 +31,124 @@ import os
 import uuid as _UUID_
 import warnings
 import StringIO
+import binascii
+import threading
 
-from normalizer import Normalizer
+from normalizer import Normalizer, MergedNormalizer, CommonLibrary
+from bundle import get_bundle_key, load_bundle, dump_bundle
+from record import Record
 from lxml.etree import parse, DTD, fromstring as XMLfromstring
 
+# the default name of the compiled bundle file
+BUNDLE_NAME = '.normalizers.bundle'
+
+def _uuid4_ints(chunk = 512):
+    """Generates random (version 4) UUIDs as integers, like uuid4().int does.
+    Random bytes are fetched from os.urandom by chunks of C{chunk} UUIDs, which
+    is way cheaper than one call to uuid4() per log."""
+    while True:
+        buf = binascii.hexlify(os.urandom(16 * chunk))
+        for i in xrange(0, len(buf), 32):
+            value = int(buf[i:i+32], 16)
+            # set the variant to RFC 4122 and the version number to 4
+            value &= ~(0xc000 << 48L)
+            value |= 0x8000 << 48L
+            value &= ~(0xf000 << 64L)
+            value |= 4 << 76L
+            yield value
+
+class _Stage(object):
+    """The active normalizers applied to a given field, in order of priority.
+
+    Normalizers whose prerequisites only bear on the "program" tag (LEA,
+    postfix, netfilter ...) are indexed by program name: the list of
+    normalizers to apply to a log is computed once per distinct program and
+    then fetched with a single dictionary lookup.
+
+    If first_match is set, the matching normalizers are looked up with a
+    L{MergedNormalizer}, which finds each of them in a single scan of the
+    log."""
+
+    # maximum amount of program names to keep in the index
+    MAX_PROGRAMS = 10000
+
+    def __init__(self, field, normalizers, first_match = False):
+        self.field = field
+        self.normalizers = normalizers
+        self.first_match = first_match
+        self._by_program = {}
+        self._engines = {}
+
+    def get_normalizers(self, program):
+        """@return: a list of (position, normalizer, prerequisites_checked)
+        tuples, giving the normalizers to apply to a log from C{program}."""
+        try:
+            return self._by_program[program]
+        except KeyError:
+            pass
+        candidates = []
+        for pos, norm in enumerate(self.normalizers):
+            prereqs = norm.prerequisites.keys()
+            if not prereqs:
+                candidates.append((pos, norm, True))
+            elif prereqs == ['program']:
+                if norm.check_prerequisites({'program' : program}):
+                    candidates.append((pos, norm, True))
+            else:
+                candidates.append((pos, norm, False))
+        if len(self._by_program) >= self.MAX_PROGRAMS:
+            self._by_program.clear()
+        self._by_program[program] = candidates
+        return candidates
+
+    def get_engine(self, program):
+        """@return: the L{MergedNormalizer} to apply to a log from C{program}.
+        Engines are shared between programs having the same normalizers."""
+        candidates = self.get_normalizers(program)
+        key = tuple([ (pos, checked) for pos, norm, checked in candidates ])
+        try:
+            return self._engines[key]
+        except KeyError:
+            pass
+        engine = MergedNormalizer([ norm for pos, norm, checked in candidates ],
+                                  [ checked for pos, norm, checked in candidates ])
+        self._engines[key] = engine
+        return engine
+
+    def normalize(self, log):
+        if self.first_match:
+            return self._normalize_merged(log)
+        done = -1
+        while True:
+            program = log.get('program', '')
+            for pos, norm, checked in self.get_normalizers(program):
+                if pos <= done:
+                    continue
+                log = norm.normalize(log, do_not_check_prereq = checked)
+                done = pos
+                if log.get('program', '') != program:
+                    # the program was changed by this normalizer, the next
+                    # ones must be looked up again.
+                    break
+            else:
+                return log
+
+    def _normalize_merged(self, log):
+        done = -1
+        while True:
+            program = log.get('program', '')
+            candidates = self.get_normalizers(program)
+            start = 0
+            while start < len(candidates) and candidates[start][0] <= done:
+                start += 1
+            changed = self.get_engine(program).apply(log, start = start,
+                                                     watch = 'program')
+            if changed is None:
+                return log
+            # the program was changed by this normalizer, the next ones must
+            # be looked up again.
+            done = candidates[changed][0]
+
 class LogNormalizer():
     """Basic normalization flow manager.
     Normalizers definitions are loaded from a path and checked against the DTD.
@@ -52,9 +166,17 @@ class LogNormalizer():
     
     * Assignment of a unique ID, under the tag "uuid"
     * Conversion of date tags to UTC, if the "_timezone" was set prior to
-      the normalization process."""
+      the normalization process.
+    
+    Instances are thread-safe : several threads can normalize logs at once,
+    without locking, while another one reloads or (de)activates normalizers.
+    The active normalizers are compiled into an immutable snapshot that
+    replaces the former one in a single assignment, so that each log goes
+    through either the former or the new normalizers; reloads are serialized
+    by a lock."""
     
-    def __init__(self, normalizers_paths, active_normalizers = {}):
+    def __init__(self, normalizers_paths, active_normalizers = {},
+                 first_match = False, bundle = False):
         """
         Instantiates a flow manager. The default behavior is to activate every
         available normalizer.
@@ -63,12 +185,22 @@ class LogNormalizer():
         XML definitions to use or a just a single path as str.
         @param active_normalizers: a dictionary of active normalizers
         in the form {name-version : [True|False]}.
+        @param first_match: if set to True, the regular expressions of the
+        normalizers applied to a same field are merged, so that the matching
+        normalizers are found in a single pass rather than by trying each of
+        them in turn. Logs are normalized the same either way.
+        @param bundle: if set to True, the loaded normalizers are saved in a
+        compiled bundle in the first normalizers path, and loaded back from it
+        as long as the definition files do not change. The path to the bundle
+        file can be given instead.
         """
         if not isinstance(normalizers_paths, list or tuple):
             normalizers_paths = [normalizers_paths,]
         self.normalizers_paths = normalizers_paths
         self.active_normalizers = active_normalizers
+        self.first_match = first_match
         self.dtd, self.ctt, self.ccb = None, None, None
+        self.dtd_path = None
         
         # Walk through paths for normalizer.dtd and common_tagTypes.xml
         # /!\ dtd file and common elements will be overrriden if present in
@@ -81,6 +213,7 @@ class LogNormalizer():
             ccb = os.path.join(norm_path, 'common_callBacks.xml')
             if os.path.isfile(dtd):
                 self.dtd = DTD(open(dtd))
+                self.dtd_path = dtd
             if os.path.isfile(ctt):
                 self.ctt = ctt
             if os.path.isfile(ccb):
@@ -89,22 +222,52 @@ class LogNormalizer():
         # But many normalizers use them, so better safe than sorry.
         if not self.dtd or not self.ctt or not self.ccb:
             raise StandardError, "Missing DTD or common library files"
+        self.bundle = None
+        if bundle is True:
+            self.bundle = os.path.join(self.normalizers_paths[0], BUNDLE_NAME)
+        elif bundle:
+            self.bundle = bundle
+        self.common = None
         self._cache = []
+        self._dispatch = ()
+        self._lock = threading.RLock()
         self.reload()
         
     def reload(self):
         """Refreshes this instance's normalizers pool."""
-        self.normalizers = { 'raw' : [], 'body' : [] }
+        self._lock.acquire()
+        try:
+            self._reload()
+        finally:
+            self._lock.release()
+
+    def _reload(self):
+        if self.bundle:
+            key = get_bundle_key([self.dtd_path, self.ctt, self.ccb] +
+                                 list(self.iter_normalizer()))
+            content = load_bundle(self.bundle, key)
+            if content is not None:
+                self.common, self.normalizers = content
+                self.common.signature = self.common.get_signature()
+                self.activate_normalizers()
+                return
+        # the common library is loaded once and shared by all the normalizers
+        if self.common is None or self.common.is_stale():
+            self.common = CommonLibrary(self.ctt, self.ccb)
+        normalizers = { 'raw' : [], 'body' : [] }
         for path in self.iter_normalizer():
             norm = parse(open(path))
             if not self.dtd.validate(norm):
                 warnings.warn('Skipping %s : invalid DTD' % path)
                 print 'invalid normalizer ', path
             else:
-                normalizer = Normalizer(norm, self.ctt, self.ccb)
+                normalizer = Normalizer(norm, self.common.tagTypes, self.common.callBacks)
                 normalizer.uuid = self._compute_norm_uuid(normalizer)
-                self.normalizers.setdefault(normalizer.appliedTo, [])
-                self.normalizers[normalizer.appliedTo].append(normalizer)
+                normalizers.setdefault(normalizer.appliedTo, [])
+                normalizers[normalizer.appliedTo].append(normalizer)
+        self.normalizers = normalizers
+        if self.bundle:
+            dump_bundle(self.bundle, key, (self.common, self.normalizers))
         self.activate_normalizers()
 
     def _compute_norm_uuid(self, normalizer):
@@ -137,6 +300,13 @@ class LogNormalizer():
         @param dir_path: the path to the directory where to copy the given
         normalizer.
         """
+        self._lock.acquire()
+        try:
+            self._update_normalizer(raw_xml_contents, name, dir_path)
+        finally:
+            self._lock.release()
+
+    def _update_normalizer(self, raw_xml_contents, name, dir_path):
         path = self.normalizers_paths[0]
         if dir_path:
             if dir_path in self.normalizers_paths:
@@ -176,28 +346,49 @@ class LogNormalizer():
         """Activates normalizers according to what was set by calling
         set_active_normalizers. If no call to the latter function has been
         made so far, this method activates every normalizer."""
+        self._lock.acquire()
+        try:
+            self._activate_normalizers()
+        finally:
+            self._lock.release()
+
+    def _activate_normalizers(self):
         if not self.active_normalizers:
             self.active_normalizers = dict([ (n.uuid, True) for n in \
                         sum([ v for v in self.normalizers.values()], []) ])
         # fool-proof the list
         self.set_active_normalizers(self.active_normalizers)
+        active_normalizers = self.active_normalizers
         # build an ordered cache to speed things up
-        self._cache = []
+        cache = []
         # First normalizers to apply are the "raw" ones.
         for norm in self.normalizers['raw']:
             # consider the normalizer to be inactive if not
             # explicitly in our list
-            if self.active_normalizers.get(norm.uuid, False):
-                self._cache.append(norm)
+            if active_normalizers.get(norm.uuid, False):
+                cache.append(norm)
         # Then, apply the applicative normalization on "body":
         for norm in self.normalizers['body']:
-            if self.active_normalizers.get(norm.uuid, False):
-                self._cache.append(norm)
+            if active_normalizers.get(norm.uuid, False):
+                cache.append(norm)
         # Then, apply everything else
         for norm in sum([ self.normalizers[u] for u in self.normalizers 
                                            if u not in ['raw', 'body']], []):
-            if self.active_normalizers.get(norm.uuid, False):
-                self._cache.append(norm)
+            if active_normalizers.get(norm.uuid, False):
+                cache.append(norm)
+        # Index the cache by the normalizers' input field, so that a log only
+        # goes through the normalizers that can actually be applied to it.
+        # Fields are checked right before their normalizers are applied, so
+        # that fields set by earlier normalizers (eg. "body") are taken into
+        # account.
+        dispatch = []
+        for norm in cache:
+            if not dispatch or dispatch[-1].field != norm.appliedTo:
+                dispatch.append(_Stage(norm.appliedTo, [], self.first_match))
+            dispatch[-1].normalizers.append(norm)
+        # the normalizing threads see the new snapshot at once
+        self._cache = cache
+        self._dispatch = tuple(dispatch)
 
     def get_active_normalizers(self):
         """Returns a dictionary of normalizers; keys are normalizers' uuid and
@@ -253,14 +444,52 @@ class LogNormalizer():
         
     def normalize(self, log):
         """plain normalization."""
-        for norm in self._cache:
-            log = norm.normalize(log)
+        for stage in self._dispatch:
+            if stage.field in log:
+                log = stage.normalize(log)
         return log
 
+    def normalize_batch(self, logs, compact = False):
+        """Normalizes a batch of logs. This is equivalent to calling
+        lognormalize on each log, but the per-log overhead (uuid generation,
+        lookups of the active normalizers) is paid once for the whole batch.
+
+        @param logs: an iterable (list, generator, file reader ...) of
+        dictionaries, each of them with at least a key 'raw' or 'body'.
+        @param compact: if True, the normalized logs are converted to
+        L{Record}s, which take much less memory than dictionaries.
+        @return: a generator yielding the normalized logs, in input order.
+        Logs are normalized lazily, as the generator is consumed.
+        """
+        uuids = _uuid4_ints()
+        dispatch = [ (stage.field, stage.normalize) for stage in self._dispatch ]
+        for log in logs:
+            log["uuid"] = uuids.next()
+            for field, normalize in dispatch:
+                if field in log:
+                    log = normalize(log)
+            if compact and type(log) is dict:
+                # normalizing a dictionary is faster, the conversion is cheap
+                log = Record(log)
+            yield log
+
+    def parallel(self, workers = None, chunksize = 256):
+        """Starts worker processes applying this instance's normalizers.
+
+        @param workers: the number of worker processes, defaults to the number
+        of CPUs.
+        @param chunksize: the number of logs sent to a worker at once.
+        @return: a L{ParallelLogNormalizer}; call its close method once done.
+        """
+        from parallel import ParallelLogNormalizer
+        return ParallelLogNormalizer(self, workers, chunksize)
+
     def _normalize(self, log):
         """Used for testing only, the normalizers' tags prerequisite are
         deactivated."""
-        for norm in self._cache:
-            log = norm.normalize(log, do_not_check_prereq = True)
+        for stage in self._dispatch:
+            if stage.field in log:
+                for norm in stage.normalizers:
+                    log = norm.normalize(log, do_not_check_prereq = True)
         return log
         
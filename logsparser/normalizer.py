@@ -27,21 +27,44 @@ used during the parsing of the definition files that is taken care of
 by the Normalizer class.
 """
 
+import os
 import re
+import sre_parse
+import sre_constants
 import csv
 import warnings
 import math
+import marshal
+import threading
+from bisect import bisect_right
 
 from lxml.etree import parse, tostring
 from datetime import datetime, timedelta # pyflakes:ignore
 import urlparse # pyflakes:ignore
-import logsparser.extras as extras # pyflakes:ignore
 
-try:
-    import GeoIP #pyflakes:ignore
-    country_code_by_address = GeoIP.new(GeoIP.GEOIP_MEMORY_CACHE).country_code_by_addr
-except ImportError, e:
-    country_code_by_address =lambda x: None
+class LazyModule(object):
+    """A stand-in for a module, imported on first attribute access. Callbacks
+    are given the extras library this way, so that processes that never run
+    a callback using it do not pay for its import."""
+    def __init__(self, name):
+        """@param name: the full name of the module"""
+        self.__name = name
+        self.__module = None
+
+    def __getattr__(self, attr):
+        module = self.__module
+        if module is None:
+            module = self.__module = __import__(self.__name, {}, {}, [attr])
+        # attributes are not cached, as the module may rebind them (see
+        # extras.load_robots)
+        return getattr(module, attr)
+
+extras = LazyModule('logsparser.extras')
+
+def country_code_by_address(address):
+    """@return: the country code of an IP address, or None if unknown. See
+    logsparser.extras.geoip; the database is loaded on the first call."""
+    return extras.country_code_by_address(address)
 
 # the following symbols and modules are allowed for use in callbacks.
 SAFE_SYMBOLS = ["list", "dict", "tuple", "set", "long", "float", "object",
@@ -74,11 +97,33 @@ class Tag(object):
         self.substitute = substitute
         self.description = description
         self.callbacks = callbacks
+        # the matching L{CallbackFunction} instances, see resolve_callbacks
+        self.callbackFunctions = ()
 
     def get_description(self, language = 'en'):
         """@Return : The tag description"""
         return self.description.get(language, 'N/A')
 
+    def resolve_callbacks(self, callbacks, genericCallBacks = {}):
+        """binds the tag to the functions of its callbacks, so that they do not
+        have to be looked up every time the tag is matched. Callbacks defined in
+        the normalizer take precedence on the generic ones.
+        @param callbacks: a dict of L{CallbackFunction} instances with callback
+        name as key
+        @param genericCallBacks: a dict of L{CallbackFunction} instances from the
+        common callbacks definition file with callback name as key
+        @return: the list of the names of the callbacks that were not found"""
+        functions = []
+        missing = []
+        for cb in self.callbacks:
+            function = callbacks.get(cb, genericCallBacks.get(cb))
+            if function is None:
+                missing.append(cb)
+            else:
+                functions.append(function)
+        self.callbackFunctions = tuple(functions)
+        return missing
+
 class TagType(object):
     """A tag type. This defines how to match a given tag."""
     def __init__(self,
@@ -155,6 +200,68 @@ def get_generic_callBacks(path = 'normalizers/common_callBacks.xml'):
                        - generic callbacks will not be available." % err)
         return {}
 
+class CommonLibrary(object):
+    """The generic tag types and callbacks, as loaded from the common library
+    files. A library is meant to be shared by all the normalizers loaded from
+    the same files and is never modified once loaded: when the files change, a
+    new library is loaded instead."""
+    def __init__(self, tagTypes_path, callBacks_path):
+        """@param tagTypes_path: path to generic tags definition xml file
+        @param callBacks_path: path to generic callbacks definition xml file"""
+        self.tagTypes_path = tagTypes_path
+        self.callBacks_path = callBacks_path
+        self.signature = self.get_signature()
+        self.tagTypes = get_generic_tagTypes(tagTypes_path)
+        self.callBacks = get_generic_callBacks(callBacks_path)
+
+    def get_signature(self):
+        """@return: the modification times and sizes of the library files."""
+        signature = []
+        for path in (self.tagTypes_path, self.callBacks_path):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime, st.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def is_stale(self):
+        """@return: True if the library files changed since they were loaded."""
+        return self.get_signature() != self.signature
+
+def get_required_literals(regexp, flags = 0):
+    """Lists the literal strings that any string matching a regular expression
+    must contain. Only ASCII literals from the mandatory parts of the
+    expression are looked at: alternatives and optional parts are skipped.
+
+    @param regexp: the regular expression, as text or as parsed by sre_parse
+    @param flags: the flags the regular expression is compiled with
+    @return: a list of strings, lowercased if flags include re.IGNORECASE"""
+    literals = []
+    def walk(sequence):
+        run = []
+        for op, av in sequence:
+            if op == sre_parse.LITERAL and av < 128:
+                run.append(chr(av))
+                continue
+            if run:
+                literals.append(''.join(run))
+                run = []
+            if op == sre_parse.SUBPATTERN:
+                walk(av[-1])
+            elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+                walk(av[2])
+        if run:
+            literals.append(''.join(run))
+    if isinstance(regexp, basestring):
+        parsed = sre_parse.parse(regexp, flags)
+    else:
+        parsed = regexp
+    walk(parsed)
+    if parsed.pattern.flags & re.IGNORECASE:
+        literals = [ l.lower() for l in literals ]
+    return literals
+
 class PatternExample(object):
     """Represents an log sample matching a given pattern. expected_tags is a
     dictionary of tag names -> values that should be obtained after the
@@ -205,6 +312,20 @@ class Pattern(object):
                  'commonTags' : self.commonTags,
                  'examples' : examples_desc }
 
+class _LineFeeder(object):
+    """Feeds a csv reader with the line it is given, one at a time."""
+    def __init__(self):
+        self.line = None
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        line, self.line = self.line, None
+        if line is None:
+            raise StopIteration
+        return line
+
 class CSVPattern(object):
     """A pattern that handle CSV case."""
     def __init__(self,
@@ -252,79 +373,178 @@ class CSVPattern(object):
         else:
             self.fields = _fields
         self.check_count = len(self.fields)
+        for tag in self.tags.values():
+            for cbname in tag.resolve_callbacks(self.callBacks or {}, self.genericCallBacks):
+                warnings.warn("Unable to find callback %s for pattern %s" %
+                              (cbname, self.name))
+        self.prepare()
 
-    def postprocess(self, data):
-        for tag in self.tags:
+    def prepare(self):
+        """precompiles the validators of the fields and sets up the csv reader."""
+        # precompile the validators of the fields, as (tag name, field,
+        # validator, callbacks). Fields matching anything are not validated.
+        self.validators = []
+        for tag in self.tags.values():
+            if tag.substitute not in self.fields:
+                continue
             # tagTypes defined in the conf file take precedence on the
             # generic ones. If nothing found either way, fall back to
             # Anything.
-            tag_regexp = self.tagTypes.get(self.tags[tag].tagtype,
-                               self.genericTagTypes.get(self.tags[tag].tagtype, self.genericTagTypes['Anything'])).regexp
-            r = re.compile(tag_regexp)
-            field = self.tags[tag].substitute
-            if field not in data.keys():
+            tag_regexp = self.tagTypes.get(tag.tagtype,
+                               self.genericTagTypes.get(tag.tagtype, self.genericTagTypes['Anything'])).regexp
+            validator = None
+            if tag_regexp not in ('', '.*', '.*?'):
+                validator = re.compile(tag_regexp).match
+            self.validators.append((tag.name, tag.substitute, validator,
+                                    tag.callbackFunctions))
+        # lines holding none of these characters are split without the
+        # csv module.
+        self.special_chars = (self.quotechar or '') + '\r\n\0'
+        # every thread feeds its own reader with the lines to split
+        self.local = threading.local()
+        try:
+            csv.reader([], delimiter = self.separator, quotechar = self.quotechar)
+            self.splittable = True
+        except TypeError:
+            # invalid dialect, no line can be split.
+            self.splittable = False
+
+    def get_reader(self):
+        """@return: the (feeder, reader) couple of the current thread."""
+        local = self.local
+        try:
+            return local.feeder, local.reader
+        except AttributeError:
+            local.feeder = _LineFeeder()
+            local.reader = csv.reader(local.feeder, delimiter = self.separator, quotechar = self.quotechar)
+            return local.feeder, local.reader
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for attr in ('validators', 'local'):
+            del state[attr]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.prepare()
+
+    def postprocess(self, data):
+        for tag, field, validator, callbacks in self.validators:
+            if field not in data:
                 continue
-            if not r.match(data[field]):
+            value = data[field]
+            if validator is not None and not validator(value):
                 # We found a tag that not matchs the expected regexp
                 return None
-            else:
-                value = data[field]
-                del data[field]
-                data[tag] = value
-                # try to apply callbacks
-                # but do not try to apply callbacks if we do not have any value
-                if not data[tag]:
-                    continue
-                callbacks_names = self.tags[tag].callbacks
-                for cbname in callbacks_names:
-                    try:
-                        # get the callback in the definition file, or look it up in the common library if not found
-                        callback = [cb for cb in self.callBacks.values() if cb.name == cbname] or\
-                                   [cb for cb in self.genericCallBacks.values() if cb.name == cbname]
-                        callback = callback[0]
-                    except:
-                        warnings.warn("Unable to find callback %s for pattern %s" %
-                                     (cbname, self.name))
-                        continue
-                    try:
-                        callback(data[tag], data)
-                    except Exception, e:
-                        raise Exception("Error on callback %s in pattern %s : %s - skipping" %
-                                       (cbname,
-                                        self.name, e))
-        # remove temporary tags
-        temp_tags = [t for t in data.keys() if t.startswith('__')]
-        for t in temp_tags:
-            del data[t]
-        empty_tags = [t for t in data.keys() if not data[t]]
-        # remove empty tags
-        for t in empty_tags:
-            del data[t]
+            del data[field]
+            data[tag] = value
+            # try to apply callbacks
+            # but do not try to apply callbacks if we do not have any value
+            if not value:
+                continue
+            for callback in callbacks:
+                try:
+                    callback(value, data)
+                except Exception, e:
+                    raise Exception("Error on callback %s in pattern %s : %s - skipping" %
+                                   (callback.name,
+                                    self.name, e))
+        # remove temporary and empty tags
+        for t, value in data.items():
+            if not value or t[:2] == '__':
+                del data[t]
         return data
 
+    def split(self, logline):
+        """splits a line into fields as the csv module would.
+        @param logline: the line to split
+        @return: the list of fields, or None if the line could not be parsed."""
+        if not self.splittable:
+            return None
+        if isinstance(logline, unicode):
+            # the csv module only handles byte strings
+            try:
+                logline = str(logline)
+            except UnicodeError:
+                return None
+        if not logline:
+            return None
+        for char in self.special_chars:
+            if char in logline:
+                break
+        else:
+            # nothing to unquote, the csv module would not do better.
+            return logline.split(self.separator)
+        feeder, reader = self.get_reader()
+        feeder.line = logline
+        try:
+            return reader.next()
+        except Exception:
+            return None
+
     def normalize(self, logline):
         # Verify logline is a basestring
         if not isinstance(logline, basestring):
             return None
-        # Try to retreive some fields with csv reader
-        try:
-            data = [data for data in csv.reader([logline], delimiter = self.separator, quotechar = self.quotechar)][0]
-        except:
+        # Try to retreive some fields
+        data = self.split(logline)
+        # Verify we have the expected number of fields
+        if not data or len(data) != self.check_count:
             return None
-        # Check we have something in data
-        if not data:
-            return None
-        else:
-            # Verify csv reader has match the expected number of fields
-            if len(data) != self.check_count:
-                return None
-            # Check expected for for fileds and apply callbacks
-            data = self.postprocess(dict(zip(self.fields, data)))
-            # Add common tags
-            if data:
-                data.update(self.commonTags)
+        # Check expected for for fileds and apply callbacks
+        data = self.postprocess(dict(zip(self.fields, data)))
+        # Add common tags
+        if data:
+            data.update(self.commonTags)
         return data
-        
+
+    def normalize_batch(self, loglines):
+        """normalizes an iterable of lines, as normalize does. The csv reader
+        and the pattern's settings are looked up once for the whole batch :
+        lines needing unquoting are all fed to the same reader, the others are
+        split by str.split, and the fields of each row are then validated.
+        @param loglines: an iterable of lines
+        @return: a generator of the normalized lines, None for the lines that
+        do not match the pattern."""
+        if not self.splittable:
+            for logline in loglines:
+                yield None
+            return
+        feeder, reader = self.get_reader()
+        separator = self.separator
+        special_chars = self.special_chars
+        fields = self.fields
+        check_count = self.check_count
+        postprocess = self.postprocess
+        commonTags = self.commonTags
+        for logline in loglines:
+            if isinstance(logline, unicode):
+                try:
+                    logline = str(logline)
+                except UnicodeError:
+                    logline = None
+            if not logline or not isinstance(logline, str):
+                yield None
+                continue
+            for char in special_chars:
+                if char in logline:
+                    feeder.line = logline
+                    try:
+                        data = reader.next()
+                    except Exception:
+                        data = None
+                    break
+            else:
+                data = logline.split(separator)
+            if not data or len(data) != check_count:
+                yield None
+                continue
+            data = postprocess(dict(zip(fields, data)))
+            if data:
+                data.update(commonTags)
+            yield data
+
     def test_examples(self):
         raise NotImplementedError
         
@@ -352,16 +572,27 @@ class CallbackFunction(object):
         source = "def __cbfunc__(value,log):\n"
         source += '\t' + '\n\t'.join(function_body.split('\n')) + '\n'
         
+        self.source = source
         self.__doc__ = "Callback function generated from the following code:\n\n" + source
         byteCode = compile(source, '<string>', 'exec')
         self.name = name
+        self.bind(byteCode)
+
+    def bind(self, byteCode):
+        """defines the callback function from its compiled source.
+        @param byteCode: the code object of the function's definition"""
+        self.byteCode = byteCode
+        source = self.source
         
         # Setup a standard-compatible python environment
         builtins   = dict()
         globs      = dict()
         locs       = dict()
-        builtins["locals"]  = lambda: locs
-        builtins["globals"] = lambda: globs
+        # the function may be called by several threads at once : locals()
+        # gives the call's own namespace, and globals() a private copy of the
+        # environment, so that calls never share mutable state.
+        builtins["locals"]  = locals
+        builtins["globals"] = lambda: dict(globs)
         globs["__builtins__"] = builtins
         globs["__name__"] = "SAFE_ENV"
         globs["__doc__"] = source
@@ -390,6 +621,19 @@ class CallbackFunction(object):
         # set the function in the safe environment
         eval(byteCode, globs, locs)
         self.cbfunction = locs["__cbfunc__"]
+
+    def __getstate__(self):
+        """the function itself cannot be pickled, its code is marshalled
+        instead."""
+        return { 'name' : self.name,
+                 'source' : self.source,
+                 'byteCode' : marshal.dumps(self.byteCode) }
+
+    def __setstate__(self, state):
+        self.name = state['name']
+        self.source = state['source']
+        self.__doc__ = "Callback function generated from the following code:\n\n" + self.source
+        self.bind(marshal.loads(state['byteCode']))
     
     def __call__(self, value, log):
         """call the instance as a function to run the callback."""
@@ -398,6 +642,113 @@ class CallbackFunction(object):
         return log
 
 
+# the previous value of a tag that did not exist
+_MISSING = object()
+
+class _LogJournal(object):
+    """A log as given to the callbacks of a matched pattern. It behaves like
+    the log, and records the previous value of every tag written through it,
+    so that a failing callback does not leave the log half normalized."""
+
+    __slots__ = ('log', 'undo')
+
+    def __init__(self, log):
+        self.log = log
+        # (tag name, previous value or _MISSING), in writing order
+        self.undo = []
+
+    def rollback(self):
+        """restores the tags written through this journal."""
+        log = self.log
+        for key, value in reversed(self.undo):
+            if value is _MISSING:
+                log.pop(key, None)
+            else:
+                log[key] = value
+        self.undo = []
+
+    def __setitem__(self, key, value):
+        self.undo.append((key, self.log.get(key, _MISSING)))
+        self.log[key] = value
+
+    def __delitem__(self, key):
+        value = self.log[key]
+        del self.log[key]
+        self.undo.append((key, value))
+
+    def __getitem__(self, key):
+        return self.log[key]
+
+    def __contains__(self, key):
+        return key in self.log
+
+    has_key = __contains__
+
+    def __iter__(self):
+        return iter(self.log)
+
+    def __len__(self):
+        return len(self.log)
+
+    def get(self, key, default = None):
+        return self.log.get(key, default)
+
+    def keys(self):
+        return self.log.keys()
+
+    def values(self):
+        return self.log.values()
+
+    def items(self):
+        return self.log.items()
+
+    def iterkeys(self):
+        return self.log.iterkeys()
+
+    def itervalues(self):
+        return self.log.itervalues()
+
+    def iteritems(self):
+        return self.log.iteritems()
+
+    def update(self, data = (), **kwargs):
+        if hasattr(data, 'keys'):
+            for key in data.keys():
+                self[key] = data[key]
+        else:
+            for key, value in data:
+                self[key] = value
+        for key, value in kwargs.iteritems():
+            self[key] = value
+
+    def pop(self, key, *default):
+        if key not in self.log:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = self.log[key]
+        del self[key]
+        return value
+
+    def setdefault(self, key, default = None):
+        if key not in self.log:
+            self[key] = default
+        return self.log[key]
+
+    def copy(self):
+        return self.log.copy()
+
+    def __eq__(self, other):
+        return self.log == other
+
+    def __ne__(self, other):
+        return self.log != other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.log)
+
 class Normalizer(object):
     """Log Normalizer, based on an XML definition file."""
     
@@ -405,13 +756,20 @@ class Normalizer(object):
         """initializes the normalizer with an lxml ElementTree.
 
         @param xmlconf: lxml ElementTree normalizer definition
-        @param genericTagTypes: path to generic tags definition xml file
+        @param genericTagTypes: path to generic tags definition xml file, or
+        the generic tag types as loaded by a L{CommonLibrary}
+        @param genericCallBacks: path to generic callbacks definition xml file,
+        or the generic callbacks as loaded by a L{CommonLibrary}
         """
         self.text_source = tostring(xmlconf, pretty_print = True)
         self.sys_path = xmlconf.docinfo.URL
         normalizer = xmlconf.getroot()
-        self.genericTagTypes = get_generic_tagTypes(genericTagTypes)
-        self.genericCallBacks = get_generic_callBacks(genericCallBacks)
+        if isinstance(genericTagTypes, basestring):
+            genericTagTypes = get_generic_tagTypes(genericTagTypes)
+        if isinstance(genericCallBacks, basestring):
+            genericCallBacks = get_generic_callBacks(genericCallBacks)
+        self.genericTagTypes = genericTagTypes
+        self.genericCallBacks = genericCallBacks
         self.description = {}
         self.authors = []
         self.tagTypes = {}
@@ -472,9 +830,34 @@ class Normalizer(object):
             elif node.tag == "finalCallbacks":
                 for callback in node:
                     self.finalCallbacks.append(callback.text)
+        # bind the tags to their callbacks, CSV patterns take care of their own
+        for pattern in self.patterns.values():
+            if isinstance(pattern, CSVPattern):
+                continue
+            for tag in pattern.tags.values():
+                for cb in tag.resolve_callbacks(self.callbacks, self.genericCallBacks):
+                    warnings.warn("Unable to find callback %s for tag %s in normalizer %s" %
+                                  (cb, tag.name, self.name))
+        self.finalCallbackFunctions = []
+        for cb in self.finalCallbacks:
+            function = self.callbacks.get(cb, self.genericCallBacks.get(cb))
+            if function is None:
+                warnings.warn("Unable to find final callback %s in normalizer %s" %
+                              (cb, self.name))
+            else:
+                self.finalCallbackFunctions.append(function)
         # precompile regexp 
         self.full_regexp, self.tags_translation, self.tags_to_pattern, whatever = self.get_uncompiled_regexp()
         self.full_regexp = re.compile(self.full_regexp, self.re_flags)
+        self.csv_patterns = [csv_pattern for csv_pattern in self.patterns.values() if isinstance(csv_pattern, CSVPattern)]
+        skeletons = dict([ (name, self.get_skeleton(pattern))
+                           for name, pattern in self.patterns.items()
+                           if not isinstance(pattern, CSVPattern) ])
+        self.prefilter = self.get_prefilter(skeletons)
+        self.branch_starts, self.branches = self.get_branches(skeletons)
+        # precompile prerequisites
+        self.compiled_prerequisites = [ (prereq, re.compile(value or ''))
+                                        for prereq, value in self.prerequisites.items() ]
     
     def __parse_patterns(self, node):
         for pattern in node:
@@ -551,6 +934,111 @@ class Normalizer(object):
                  'commonTags' : self.commonTags,
                  'taxonomy' : self.taxonomy }
 
+    def get_tagType(self, tag):
+        """@return: the L{TagType} of tag. tagTypes defined in the conf file
+        take precedence on the generic ones. If nothing found either way, fall
+        back to Anything."""
+        return self.tagTypes.get(tag.tagtype,
+                                 self.genericTagTypes.get(tag.tagtype,
+                                                          self.genericTagTypes['Anything']))
+
+    def get_skeleton(self, pattern):
+        """parses a pattern with its tags replaced by a placeholder group, this
+        is way cheaper to parse than the tag types' regular expressions.
+        @param pattern: a L{Pattern} instance
+        @return: the pattern's skeleton, as parsed by sre_parse"""
+        regexp = pattern.pattern
+        if self.expandWhitespaces:
+            regexp = re.sub("\s+", "\s+", regexp)
+        for tag in pattern.tags.values():
+            regexp = regexp.replace(tag.substitute, '(?:.)')
+        return sre_parse.parse(regexp, self.re_flags)
+
+    def get_prefilter(self, skeletons = None):
+        """computes the prefilter of this normalizer's regular expression. Each
+        pattern contributes its longest required literal; a value that contains
+        none of them cannot match any pattern, so trying the regular expression
+        on it can be skipped.
+        @param skeletons: an optional dictionary of pattern names <-> skeletons
+        as returned by get_skeleton
+        @return: a tuple of literals, or None if a pattern has no required
+                 literal (the prefilter is then useless).
+        """
+        # inline flags of the tag types' regular expressions apply to the
+        # whole expression, yet they are not part of the skeletons
+        self.prefilter_ignorecase = bool(self.full_regexp.flags & re.IGNORECASE)
+        literals = set()
+        for name, pattern in self.patterns.items():
+            if isinstance(pattern, CSVPattern):
+                continue
+            skeleton = (skeletons or {}).get(name) or self.get_skeleton(pattern)
+            required = get_required_literals(skeleton)
+            if not required:
+                return None
+            literal = max(required, key = len)
+            if self.prefilter_ignorecase:
+                literal = literal.lower()
+            literals.add(literal)
+        if not literals:
+            return None
+        # a literal containing another one is redundant
+        literals = [ l for l in literals
+                     if not [ o for o in literals if o != l and o in l ] ]
+        return tuple(sorted(literals, key = len, reverse = True))
+
+    def get_branches(self, skeletons = None):
+        """maps the groups of the full regular expression to the patterns they
+        come from, so that only the groups of the matching pattern have to be
+        looked at once the expression matched.
+        @param skeletons: an optional dictionary of pattern names <-> skeletons
+        as returned by get_skeleton
+        @return: the sorted list of the index of the first group of each pattern,
+                 and the matching list of (pattern, tags, temporary tags,
+                 callbacks flag) where tags is a list of (group index, L{Tag})
+                 and the callbacks flag tells whether any of these tags has
+                 callbacks."""
+        tags = {}
+        for code, index in self.full_regexp.groupindex.items():
+            tags.setdefault(self.tags_to_pattern[code], []).append((index, code))
+        starts = []
+        branches = []
+        first = 1
+        for name in sorted(self.patterns.keys()):
+            pattern = self.patterns[name]
+            if isinstance(pattern, CSVPattern):
+                continue
+            skeleton = (skeletons or {}).get(name) or self.get_skeleton(pattern)
+            # the groups of the pattern itself, then the tags and their own groups
+            groups = skeleton.pattern.groups - 1
+            pattern_tags = []
+            for index, code in sorted(tags.get(name, [])):
+                tag = pattern.tags[self.tags_translation[code]]
+                groups += 1 + self.get_tagType(tag).compiled_regexp.groups
+                pattern_tags.append((index, tag))
+            starts.append(first)
+            branches.append((pattern,
+                             tuple(pattern_tags),
+                             tuple([ t.name for i, t in pattern_tags
+                                     if t.name.startswith('__') ]),
+                             bool([ t for i, t in pattern_tags
+                                    if t.callbackFunctions ])))
+            first += groups
+        if first - 1 != self.full_regexp.groups:
+            raise ValueError, "Could not map the groups of normalizer %s to its patterns" % self.name
+        return starts, branches
+
+    def matches_prefilter(self, value):
+        """@return: False if value cannot match this normalizer's regular
+        expression, True if it may."""
+        if self.prefilter is None or not isinstance(value, basestring):
+            return True
+        if self.prefilter_ignorecase:
+            value = value.lower()
+        for literal in self.prefilter:
+            if literal in value:
+                return True
+        return False
+
     def get_uncompiled_regexp(self, p = None, increment = 0):
         """returns the uncompiled regular expression associated to pattern named p.
         If p is None, all patterns are stitched together, ready for compilation.
@@ -578,13 +1066,7 @@ class Normalizer(object):
             if self.expandWhitespaces:
                 regexp = re.sub("\s+", "\s+", regexp)
             for tagname, tag in self.patterns[pattern].tags.items():
-                # tagTypes defined in the conf file take precedence on the
-                # generic ones. If nothing found either way, fall back to
-                # Anything.
-                
-                tag_regexp = self.tagTypes.get(tag.tagtype, 
-                                               self.genericTagTypes.get(tag.tagtype,
-                                                                        self.genericTagTypes['Anything'])).regexp
+                tag_regexp = self.get_tagType(tag).regexp
                 named_group = '(?P<tag%i>%s)' % (increment, tag_regexp)
                 regexp = regexp.replace(tag.substitute, named_group)
                 tags_translations['tag%i' % increment] = tagname
@@ -593,82 +1075,109 @@ class Normalizer(object):
             regexps.append("(?:%s)" % regexp)
         return "|".join(regexps), tags_translations, tags_to_pattern, increment
 
+    def check_prerequisites(self, log):
+        """@param log: a dictionary or an object providing at least a get() method
+        @return: True if the log's tags match this normalizer's prerequisites."""
+        for prereq, regexp in self.compiled_prerequisites:
+            if not regexp.match(log.get(prereq, '')):
+                return False
+        return True
+
     def normalize(self, log, do_not_check_prereq = False):
         """normalization in standalone mode.
         @param log: a dictionary or an object providing at least a get() method
         @param do_not_check_prereq: if set to True, the prerequisite tags check
         is skipped (debug purpose only)
         @return: a dictionary with updated tags if normalization was successful."""
+        self.apply(log, do_not_check_prereq)
+        return log
+
+    def apply(self, log, do_not_check_prereq = False):
+        """normalizes log in place.
+        @param log: a dictionary or an object providing at least a get() method
+        @param do_not_check_prereq: if set to True, the prerequisite tags check
+        is skipped
+        @return: True if one of the patterns matched the log, False otherwise."""
         if isinstance(log, basestring) or not hasattr(log, "get"):
             raise ValueError, "the normalizer expects an argument of type Dict"
         # Test prerequisites
-        if all( [ re.match(value, log.get(prereq, ''))
-                  for prereq, value in self.prerequisites.items() ]) or\
-           do_not_check_prereq:
-            csv_patterns = [csv_pattern for csv_pattern in self.patterns.values() if isinstance(csv_pattern, CSVPattern)]
-            if self.appliedTo in log.keys():
-                m = getattr(self.full_regexp, self.matchtype)(log[self.appliedTo])
-                if m is not None:
-                    m = m.groupdict()
-                if m:
-                    # this little trick makes the following line not type dependent
-                    temp_wl = dict([ (u, log[u]) for u in log.keys() ])
-                    for tag in m:
-                        if m[tag] is not None:
-                            matched_pattern = self.patterns[self.tags_to_pattern[tag]]
-                            temp_wl[self.tags_translation[tag]] = m[tag]
-                            # apply eventual callbacks
-                            for cb in matched_pattern.tags[self.tags_translation[tag]].callbacks:
-                                # TODO it could be desirable to make sure the callback
-                                # does not try to change important preset values such as
-                                # 'raw' and 'uuid'.
-                                try:
-                                    # if the callback doesn't exist in the normalizer file, it will
-                                    # search in the commonCallBack file.
-                                    temp_wl = self.callbacks.get(cb, self.genericCallBacks.get(cb))(m[tag], temp_wl)
-                                except Exception, e:
-                                    pattern_name = self.patterns[self.tags_to_pattern[tag]].name
-                                    raise Exception("Error on callback %s in pattern %s : %s - skipping" %
-                                                    (self.callbacks[cb].name,
-                                                     pattern_name, e))
-                            # remove temporary tags
-                            if self.tags_translation[tag].startswith('__'):
-                                del temp_wl[self.tags_translation[tag]]
-                    log.update(temp_wl)
-                    # add the pattern's common Tags
-                    log.update(matched_pattern.commonTags) 
-                    # then add the normalizer's common Tags
-                    log.update(self.commonTags)
-                    # then add the taxonomy if relevant
-                    if self.taxonomy:
-                        log['taxonomy'] = self.taxonomy
-                    # and finally, apply the final callbacks
-                    for cb in self.finalCallbacks:
+        if not (do_not_check_prereq or self.check_prerequisites(log)) or \
+           self.appliedTo not in log:
+            return False
+        m = None
+        if self.matches_prefilter(log[self.appliedTo]):
+            m = getattr(self.full_regexp, self.matchtype)(log[self.appliedTo])
+        if m is not None and m.lastindex is not None:
+            self.apply_match(log, m, m.lastindex)
+            return True
+        for csv_pattern in self.csv_patterns:
+            ret = csv_pattern.normalize(log[self.appliedTo])
+            if ret:
+                log.update(ret)
+                self._finalize(log)
+                return True
+        return False
+
+    def apply_match(self, log, m, lastindex, offset = 0):
+        """tags log with the groups of the pattern that matched it.
+        @param log: the log to update
+        @param m: the match object of this normalizer's regular expression, or
+        of an expression embedding it
+        @param lastindex: the index of the last matched group, relative to this
+        normalizer's regular expression
+        @param offset: the number of groups preceding this normalizer's
+        expression in m's expression"""
+        pattern, tags, temp_tags, has_callbacks = \
+            self.branches[bisect_right(self.branch_starts, lastindex) - 1]
+        if has_callbacks:
+            # callbacks may fail halfway : the tags written are recorded to be
+            # rolled back then
+            journal = _LogJournal(log)
+            try:
+                for index, tag in tags:
+                    value = m.group(index + offset)
+                    if value is None:
+                        continue
+                    journal[tag.name] = value
+                    # apply eventual callbacks
+                    for cb in tag.callbackFunctions:
+                        # TODO it could be desirable to make sure the callback
+                        # does not try to change important preset values such as
+                        # 'raw' and 'uuid'.
                         try:
-                            log.update(self.callbacks.get(cb, self.genericCallBacks.get(cb))(None, log))
+                            cb(value, journal)
                         except Exception, e:
-                            raise Exception("Cannot apply final callback %s : %r - skipping" % (cb, e))
-                elif csv_patterns:
-                    # this little trick makes the following line not type dependent
-                    temp_wl = dict([ (u, log[u]) for u in log.keys() ])
-                    ret = None
-                    for csv_pattern in csv_patterns:
-                        ret = csv_pattern.normalize(temp_wl[self.appliedTo])
-                        if ret:
-                            log.update(ret)
-                            # then add the normalizer's common Tags
-                            log.update(self.commonTags)
-                            # then add the taxonomy if relevant
-                            if self.taxonomy:
-                                log['taxonomy'] = self.taxonomy
-                            # and finally, apply the final callbacks
-                            for cb in self.finalCallbacks:
-                                try:
-                                    log.update(self.callbacks.get(cb, self.genericCallBacks.get(cb))(None, log))
-                                except Exception, e:
-                                    raise Exception("Cannot apply final callback %s : %r - skipping" % (cb, e))
-                            break
-        return log
+                            raise Exception("Error on callback %s in pattern %s : %s - skipping" %
+                                            (cb.name, pattern.name, e))
+            except:
+                journal.rollback()
+                raise
+        else:
+            for index, tag in tags:
+                value = m.group(index + offset)
+                if value is not None:
+                    log[tag.name] = value
+        # remove temporary tags
+        for name in temp_tags:
+            if name in log:
+                del log[name]
+        # add the pattern's common Tags
+        log.update(pattern.commonTags)
+        self._finalize(log)
+
+    def _finalize(self, log):
+        """adds the normalizer's common tags and taxonomy to a matched log,
+        then applies the final callbacks."""
+        log.update(self.commonTags)
+        # then add the taxonomy if relevant
+        if self.taxonomy:
+            log['taxonomy'] = self.taxonomy
+        # and finally, apply the final callbacks
+        for cb in self.finalCallbackFunctions:
+            try:
+                log.update(cb(None, log))
+            except Exception, e:
+                raise Exception("Cannot apply final callback %s : %r - skipping" % (cb.name, e))
 
     def validate(self):
         """if the definition file comes with pattern examples, this method can
@@ -686,14 +1195,7 @@ class Normalizer(object):
                 elif isinstance(self.patterns[p], CSVPattern):
                     w = self.patterns[p].normalize(example.raw_line)
                     if w:
-                        w.update(self.commonTags)
-                        if self.taxonomy:
-                            w['taxonomy'] = self.taxonomy
-                        for cb in self.finalCallbacks:
-                            try:
-                                w.update(self.callbacks.get(cb, self.genericCallBacks.get(cb))(None, w))
-                            except Exception, e:
-                                raise Exception("Cannot apply final callback %s : %r - skipping" % (cb, e))
+                        self._finalize(w)
                 for expectedTag in example.expected_tags.keys():
                     if isinstance(w.get(expectedTag), datetime):
                         svalue = str(w.get(expectedTag))
@@ -719,6 +1221,165 @@ class Normalizer(object):
         returns them as a list."""
         return self.description.keys()
         
+# Python 2 cannot compile regular expressions holding more than 100 groups
+MAX_GROUPS = getattr(sre_constants, 'MAXGROUPS', 100) - 1
+
+class MergedNormalizer(object):
+    """Applies, in order of precedence, the normalizers of a list of
+    normalizers applied to the same field that match a log.
+
+    The regular expressions of consecutive normalizers sharing the same flags
+    are merged into a single alternation, the normalizer to apply being
+    identified by the index of the last group matched. Finding the next
+    matching normalizer thus takes a single scan of the log rather than one
+    per normalizer. Once a normalizer is applied, the scan resumes with the
+    normalizers that follow it, so that logs are tagged as if every
+    normalizer had been tried in turn. Normalizers that cannot be merged (CSV
+    patterns, "search" match type ...) are tried on their own."""
+
+    # the names of the groups generated by get_uncompiled_regexp
+    _TAG_GROUP = re.compile(r'(?<!\\)\(\?P<tag\d+>')
+
+    def __init__(self, normalizers, checked = None):
+        """@param normalizers: a list of L{Normalizer} instances applied to the
+        same field, in order of precedence.
+        @param checked: an optional list of booleans telling for each
+        normalizer whether its prerequisites are known to be met."""
+        if checked is None:
+            checked = [False] * len(normalizers)
+        self.normalizers = normalizers
+        self.appliedTo = normalizers and normalizers[0].appliedTo or None
+        self.chunks = []
+        # the index in normalizers of the first member of each chunk
+        self.chunk_starts = []
+        # the regexps merging the members of a chunk following a given one, by
+        # (chunk index, member index), compiled when first needed
+        self._suffixes = {}
+        chunk = []
+        for norm, ok in zip(normalizers, checked):
+            if not self._is_mergeable(norm):
+                self._add_chunk(chunk)
+                self._add_chunk([(norm, ok)])
+                chunk = []
+                continue
+            # inline flags apply to the whole merged regexp : only members
+            # compiled with the same flags, inline ones included, are merged
+            if chunk and (norm.full_regexp.flags != chunk[0][0].full_regexp.flags or
+                          sum([n.full_regexp.groups for n, o in chunk]) +
+                          norm.full_regexp.groups > MAX_GROUPS):
+                self._add_chunk(chunk)
+                chunk = []
+            chunk.append((norm, ok))
+        self._add_chunk(chunk)
+
+    def _is_mergeable(self, norm):
+        return norm.matchtype == 'match' and not norm.csv_patterns and \
+               bool(norm.full_regexp.groupindex)
+
+    def _merge(self, chunk):
+        """@param chunk: a list of (normalizer, prerequisites checked)
+        @return: a tuple (regexp, members, offsets), where members is a list of
+        (normalizer, prerequisites checked, offset of the normalizer's groups),
+        and offsets the sorted list of the index of the first group of each
+        member. regexp is None if the chunk holds a single normalizer, to be
+        tried on its own."""
+        if len(chunk) == 1:
+            norm, ok = chunk[0]
+            return None, [(norm, ok, 0)], [1]
+        regexps = []
+        members = []
+        offsets = []
+        offset = 0
+        for norm, ok in chunk:
+            regexps.append('(?:%s)' % self._TAG_GROUP.sub('(', norm.full_regexp.pattern))
+            members.append((norm, ok, offset))
+            offsets.append(offset + 1)
+            offset += norm.full_regexp.groups
+        regexp = re.compile('|'.join(regexps), chunk[0][0].full_regexp.flags)
+        return regexp, members, offsets
+
+    def _add_chunk(self, chunk):
+        """adds a list of (normalizer, prerequisites checked) to the chunks to
+        try, as merged by _merge."""
+        if not chunk:
+            return
+        try:
+            merged = self._merge(chunk)
+        except Exception:
+            # eg. the same group name is used in tag types of many normalizers
+            for member in chunk:
+                self._add_chunk([member])
+            return
+        self.chunk_starts.append(sum([ len(c[1]) for c in self.chunks ]))
+        self.chunks.append(merged)
+
+    def _get_suffix(self, c, first):
+        """@return: the chunk c, merged from its member first on."""
+        if first == 0:
+            return self.chunks[c]
+        try:
+            return self._suffixes[(c, first)]
+        except KeyError:
+            pass
+        members = self.chunks[c][1]
+        # a subset of an alternation that compiled, this compiles too
+        suffix = self._merge([ (norm, ok) for norm, ok, offset in members[first:] ])
+        self._suffixes[(c, first)] = suffix
+        return suffix
+
+    def normalize(self, log, do_not_check_prereq = False):
+        """@return: the log, normalized by every matching normalizer."""
+        self.apply(log, do_not_check_prereq)
+        return log
+
+    def apply(self, log, do_not_check_prereq = False, start = 0, watch = None):
+        """normalizes log in place with every matching normalizer, in order.
+        @param start: the index of the first normalizer to try
+        @param watch: the name of a tag. If a normalizer changes it, the
+        normalizers that follow are not tried.
+        @return: the index of the normalizer that changed the watched tag, or
+        None if every normalizer was tried."""
+        count = len(self.normalizers)
+        watched = watch and log.get(watch, '')
+        i = start
+        while i < count:
+            if self.appliedTo not in log:
+                return None
+            c = bisect_right(self.chunk_starts, i) - 1
+            chunk_start = self.chunk_starts[c]
+            regexp, members, offsets = self._get_suffix(c, i - chunk_start)
+            if regexp is None:
+                norm, ok, offset = members[0]
+                applied = i
+                i += 1
+                if not norm.apply(log, do_not_check_prereq or ok):
+                    continue
+            else:
+                m = regexp.match(log[self.appliedTo])
+                if m is None:
+                    # none of the remaining members of the chunk matches
+                    i += len(members)
+                    continue
+                if m.lastindex is None:
+                    # no group tells which member matched : try the first one
+                    # on its own, and scan the others again if it does not
+                    norm, ok, offset = members[0]
+                    applied = i
+                    i += 1
+                    if not norm.apply(log, do_not_check_prereq or ok):
+                        continue
+                else:
+                    k = bisect_right(offsets, m.lastindex) - 1
+                    norm, ok, offset = members[k]
+                    applied = i + k
+                    i = applied + 1
+                    if not (do_not_check_prereq or ok or norm.check_prerequisites(log)):
+                        continue
+                    norm.apply_match(log, m, m.lastindex - offset, offset)
+            if watch and log.get(watch, '') != watched:
+                return applied
+        return None
+
 # Documentation generator
 def doc2RST(description, gettext = None):
     """ Returns a RestructuredText documentation from
@@ -0,0 +1,269 @@
+# -*- python -*-
+
+# pylogsparser - Logs parsers python library
+#
+# Copyright (C) 2011 Wallix Inc.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+#
+
+"""This module exposes the L{ParallelLogNormalizer} class, which spreads the
+normalization of logs over several processes.
+
+Each worker process holds its own copy of a L{LogNormalizer}'s normalizers,
+inherited when it is forked. Logs are sent to the workers by chunks, over a
+task queue per worker, and the normalized logs come back over a result pipe
+per worker, so that a worker dying cannot block the others. The death of a
+worker shows as the end of its pipe : it is replaced at once, and the chunks
+it was working on are handed over to its replacement.
+"""
+
+import select
+import traceback
+import multiprocessing
+
+def _work(normalizer, tasks, results):
+    """The main loop of a worker process.
+
+    Tasks are either None, to stop the worker, ('chunk', seq, logs, compact)
+    to normalize a chunk of logs, or ('call', method, args) to call a method of
+    the normalizer (reload, set_active_normalizers ...). Results are
+    (seq, normalized logs, error) tuples, sent over the results connection."""
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        if task[0] == 'chunk':
+            seq, logs, compact = task[1:]
+            try:
+                results.send((seq, list(normalizer.normalize_batch(logs, compact)), None))
+            except Exception:
+                results.send((seq, None, traceback.format_exc()))
+        else:
+            method, args = task[1], task[2]
+            getattr(normalizer, method)(*args)
+
+class ParallelLogNormalizer(object):
+    """Normalization flow manager dispatching logs to a pool of worker
+    processes, each of them applying a copy of a L{LogNormalizer}.
+
+    Normalized logs are copies : unlike with L{LogNormalizer}, the input
+    dictionaries are left untouched. Only one call to normalize_batch can be
+    in progress at a time."""
+
+    # the number of times a chunk is handed over to a new worker when the
+    # worker processing it dies
+    MAX_RETRIES = 2
+    # the delay between two checks of the workers' health while waiting for
+    # results, in seconds. Dead workers are noticed at once anyway, through
+    # their result pipe.
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, normalizer, workers = None, chunksize = 256):
+        """
+        Starts the worker processes.
+
+        @param normalizer: the L{LogNormalizer} to apply.
+        @param workers: the number of worker processes, defaults to the number
+        of CPUs.
+        @param chunksize: the number of logs sent to a worker at once.
+        """
+        self.normalizer = normalizer
+        self.chunksize = chunksize
+        # the workers, as (process, task queue, result connection)
+        self.workers = []
+        # the chunks being processed, as
+        # seq : [worker index, logs, retries, compact]
+        self.pending = {}
+        self._seq = 0
+        for wid in range(workers or multiprocessing.cpu_count()):
+            self.workers.append(None)
+            self._spawn(wid)
+
+    def _spawn(self, wid):
+        """starts the worker process wid, with a fresh task queue and result
+        pipe."""
+        tasks = multiprocessing.Queue()
+        results, writer = multiprocessing.Pipe(duplex = False)
+        process = multiprocessing.Process(target = _work,
+                                          args = (self.normalizer, tasks,
+                                                  writer))
+        process.daemon = True
+        process.start()
+        # the worker holds the only writing end left, so that its pipe ends
+        # when it dies
+        writer.close()
+        self.workers[wid] = (process, tasks, results)
+
+    def _submit(self, seq, logs, retries = 0, compact = False):
+        """sends a chunk of logs to the least busy worker."""
+        load = [0] * len(self.workers)
+        for wid, chunk, r, c in self.pending.values():
+            load[wid] += 1
+        wid = load.index(min(load))
+        self.pending[seq] = [wid, logs, retries, compact]
+        self.workers[wid][1].put(('chunk', seq, logs, compact))
+
+    def _replace(self, wid):
+        """replaces the dead worker wid, handing its chunks over to live
+        ones."""
+        process, tasks, results = self.workers[wid]
+        process.join(self.POLL_INTERVAL)
+        if process.is_alive():
+            process.terminate()
+        results.close()
+        # the tasks left in the queue are resubmitted below. They are drained
+        # first : the queue's reading end was inherited by the workers forked
+        # since, so that its feeder thread would never be done writing them.
+        try:
+            while True:
+                tasks.get(True, 0.1)
+        except Exception:
+            # Empty once drained, or the error on a task half read by the dead
+            # worker
+            pass
+        tasks.close()
+        tasks.join_thread()
+        self._spawn(wid)
+        for seq, (w, logs, retries, compact) in self.pending.items():
+            if w != wid:
+                continue
+            if retries >= self.MAX_RETRIES:
+                del self.pending[seq]
+                raise RuntimeError, "Workers died %s times normalizing a chunk of logs" % (retries + 1)
+            self._submit(seq, logs, retries + 1, compact)
+
+    def _check_workers(self):
+        """replaces dead workers, handing their chunks over to live ones."""
+        for wid, (process, tasks, results) in enumerate(self.workers):
+            if not process.is_alive():
+                self._replace(wid)
+
+    def _results(self, seqs):
+        """@return: the next (seq, logs) result among the chunks seqs,
+        waiting for it if needed."""
+        while True:
+            connections = dict([ (results.fileno(), wid) for wid, (process, tasks, results)
+                                 in enumerate(self.workers) ])
+            ready = select.select(connections.keys(), [], [], self.POLL_INTERVAL)[0]
+            if not ready:
+                self._check_workers()
+                continue
+            wid = connections[ready[0]]
+            try:
+                seq, logs, error = self.workers[wid][2].recv()
+            except (EOFError, IOError):
+                # the worker died, maybe in the middle of a result
+                self._replace(wid)
+                continue
+            if self.pending.pop(seq, None) is None:
+                # a chunk processed twice, or left over by an abandoned call
+                continue
+            if seq not in seqs:
+                continue
+            seqs.discard(seq)
+            if error is not None:
+                raise RuntimeError, "Normalization failed in a worker :\n%s" % error
+            return seq, logs
+
+    def _broadcast(self, method, *args):
+        """calls a method of the normalizer, here and in every worker. Workers
+        apply it once they are done with the chunks already sent to them."""
+        result = getattr(self.normalizer, method)(*args)
+        for process, tasks, results in self.workers:
+            tasks.put(('call', method, args))
+        return result
+
+    def reload(self):
+        """Refreshes the normalizers pool of every worker."""
+        return self._broadcast('reload')
+
+    def set_active_normalizers(self, norms = {}):
+        """See L{LogNormalizer.set_active_normalizers}."""
+        return self._broadcast('set_active_normalizers', norms)
+
+    def activate_normalizers(self):
+        """See L{LogNormalizer.activate_normalizers}."""
+        return self._broadcast('activate_normalizers')
+
+    def get_active_normalizers(self):
+        """See L{LogNormalizer.get_active_normalizers}."""
+        return self.normalizer.get_active_normalizers()
+
+    def normalize_batch(self, logs, ordered = True, compact = False):
+        """Normalizes logs in the worker processes.
+
+        @param logs: an iterable (list, generator, file reader ...) of
+        dictionaries, each of them with at least a key 'raw' or 'body'.
+        @param ordered: if True, the normalized logs are yielded in input
+        order. Otherwise they are yielded as soon as their chunk is done.
+        @param compact: if True, the normalized logs are L{Record}s, see
+        L{LogNormalizer.normalize_batch}. They are converted by the workers,
+        and take less room in the result pipes too.
+        @return: a generator yielding the normalized logs.
+        """
+        # keep every worker busy, with a chunk waiting in its queue, but do not
+        # hold more chunks than that when waiting for a late one
+        max_pending = 2 * len(self.workers)
+        seqs = set()
+        done = {}
+        next_seq = self._seq
+        chunk = []
+        logs = iter(logs)
+        exhausted = False
+        while True:
+            while not exhausted and len(seqs) + len(done) < max_pending:
+                for log in logs:
+                    chunk.append(log)
+                    if len(chunk) >= self.chunksize:
+                        break
+                else:
+                    exhausted = True
+                if chunk:
+                    seqs.add(self._seq)
+                    self._submit(self._seq, chunk, compact = compact)
+                    self._seq += 1
+                    chunk = []
+            if not seqs:
+                break
+            seq, normalized = self._results(seqs)
+            if not ordered:
+                for log in normalized:
+                    yield log
+                continue
+            done[seq] = normalized
+            while next_seq in done:
+                for log in done.pop(next_seq):
+                    yield log
+                next_seq += 1
+
+    def lognormalize(self, data):
+        """Normalizes a single log in a worker process.
+
+        @return: the normalized log."""
+        for log in self.normalize_batch([data]):
+            return log
+
+    def close(self):
+        """Stops the worker processes."""
+        for process, tasks, results in self.workers:
+            tasks.put(None)
+        for process, tasks, results in self.workers:
+            process.join(1)
+            if process.is_alive():
+                process.terminate()
+            results.close()
+        self.workers = []
+        self.pending = {}
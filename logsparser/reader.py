@@ -0,0 +1,222 @@
+# -*- python -*-
+
+# pylogsparser - Logs parsers python library
+#
+# Copyright (C) 2011 Wallix Inc.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+#
+
+"""Streaming of log files into the normalizers.
+
+Files are read by large blocks, which are decoded and split into lines as a
+whole, so that arbitrarily large files are normalized in bounded memory.
+gzip, bzip2 and xz compressed files are decompressed on the fly, be they read
+from a path, a pipe, the standard input or a file object; xz needs the lzma
+module (python 3.3+ or backports.lzma).
+"""
+
+import sys
+import bz2
+import zlib
+
+try:
+    import lzma
+except ImportError:
+    try:
+        from backports import lzma #pyflakes:ignore
+    except ImportError:
+        lzma = None
+
+# the default size of the blocks read, in bytes
+BUFSIZE = 1 << 20
+# the size of the blocks of compressed data read, in bytes. It is smaller, as
+# the decompressed data may be many times larger
+COMPRESSED_BUFSIZE = 1 << 16
+
+# the leading bytes of compressed files
+MAGIC = (('\x1f\x8b', 'gzip'),
+         ('BZh', 'bzip2'),
+         ('\xfd7zXZ\x00', 'xz'))
+
+def _gzip_decompressor():
+    # the gzip header and trailer are handled by zlib itself
+    return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+class _Stream(object):
+    """A file-like object returning the bytes of another one, decompressed if
+    needed. The leading bytes read from it to guess its compression are given
+    back first, so that it is never seeked : pipes are read like files."""
+
+    def __init__(self, f, head, decompressor = None, owned = True):
+        """
+        @param f: the file-like object read
+        @param head: the bytes already read from f
+        @param decompressor: a callable returning a new decompressor, called
+        for each of the compressed streams f holds one after the other. None
+        if f is not compressed.
+        @param owned: if True, f is closed along with this object
+        """
+        self.f = f
+        self.new_decompressor = decompressor
+        self.decompressor = decompressor and decompressor()
+        self.owned = owned
+        # the bytes ready to be returned, and their total size
+        self.pieces = []
+        self.length = 0
+        self.eof = False
+        self._feed(head)
+
+    def _feed(self, data):
+        """decompresses data if needed, appending it to the bytes ready."""
+        while data:
+            if self.decompressor is None:
+                out, unused = data, ''
+            else:
+                try:
+                    out = self.decompressor.decompress(data)
+                    unused = self.decompressor.unused_data
+                except EOFError:
+                    # the previous stream ended with the previous block
+                    out, unused = '', data
+            if out:
+                self.pieces.append(out)
+                self.length += len(out)
+            # another stream follows, unless this is trailing padding
+            if not unused.strip('\x00'):
+                break
+            self.decompressor = self.new_decompressor()
+            data = unused
+
+    def read(self, size = -1):
+        """@param size: the number of bytes to return, all of them if negative
+        @return: at most size bytes, less only at the end of the file"""
+        while not self.eof and (size < 0 or self.length < size):
+            if self.decompressor is not None:
+                block = self.f.read(COMPRESSED_BUFSIZE)
+            elif size < 0:
+                block = self.f.read(BUFSIZE)
+            else:
+                block = self.f.read(size - self.length)
+            if not block:
+                self.eof = True
+                break
+            self._feed(block)
+        data = ''.join(self.pieces)
+        if 0 <= size < len(data):
+            data, rest = data[:size], data[size:]
+            self.pieces, self.length = [rest], len(rest)
+        else:
+            self.pieces, self.length = [], 0
+        return data
+
+    def close(self):
+        if self.owned:
+            self.f.close()
+
+def open_log(source):
+    """opens a log file for reading, decompressing it if needed. The
+    compression is guessed from the leading bytes of the file, whatever it
+    is : regular file, pipe, standard input or file object.
+    @param source: a path, '-' for the standard input, or a file object
+    @return: a file-like object returning the (uncompressed) bytes of source.
+    Closing it closes source only if it was opened from a path."""
+    if source == '-':
+        f, owned = sys.stdin, False
+    elif isinstance(source, basestring):
+        f, owned = open(source, 'rb'), True
+    else:
+        f, owned = source, False
+    head = ''
+    while len(head) < 6:
+        data = f.read(6 - len(head))
+        if not data:
+            break
+        head += data
+    for magic, compression in MAGIC:
+        if head.startswith(magic):
+            break
+    else:
+        return _Stream(f, head, owned = owned)
+    if compression == 'gzip':
+        decompressor = _gzip_decompressor
+    elif compression == 'bzip2':
+        decompressor = bz2.BZ2Decompressor
+    elif lzma is None:
+        if owned:
+            f.close()
+        raise ValueError, "Cannot read xz compressed file %s : the lzma module is not available" % source
+    else:
+        decompressor = lzma.LZMADecompressor
+    return _Stream(f, head, decompressor, owned)
+
+def read_lines(f, encoding = 'utf-8', bufsize = BUFSIZE):
+    """reads the lines of a file, by blocks of bufsize bytes.
+    @param f: a file-like object
+    @param encoding: the encoding of the file. Lines are returned as unicode
+    strings, undecodable bytes being replaced. If None, lines are returned
+    as read from f.
+    @param bufsize: the size of the blocks read
+    @return: a generator yielding the lines, without their line terminators"""
+    # the blocks read since the last line terminator, joined only once one
+    # comes so that long lines are not copied over at each block
+    pieces = []
+    while True:
+        block = f.read(bufsize)
+        if not block:
+            break
+        end = block.rfind('\n')
+        if end < 0:
+            pieces.append(block)
+            continue
+        pieces.append(block[:end])
+        remainder = block[end + 1:]
+        block = ''.join(pieces)
+        pieces = remainder and [remainder] or []
+        if encoding is not None and not isinstance(block, unicode):
+            block = block.decode(encoding, 'replace')
+        for line in block.split('\n'):
+            if line.endswith('\r'):
+                line = line[:-1]
+            yield line
+    remainder = ''.join(pieces)
+    if remainder:
+        if encoding is not None and not isinstance(remainder, unicode):
+            remainder = remainder.decode(encoding, 'replace')
+        if remainder.endswith('\r'):
+            remainder = remainder[:-1]
+        yield remainder
+
+def normalize_file(normalizer, source, encoding = 'utf-8', bufsize = BUFSIZE,
+                   skip_empty = True):
+    """normalizes the logs of a file, one log per line.
+    @param normalizer: a L{LogNormalizer} or a L{ParallelLogNormalizer}
+    @param source: a path, '-' for the standard input, or a file object, as
+    accepted by open_log
+    @param encoding: the encoding of the file, see read_lines
+    @param bufsize: the size of the blocks read
+    @param skip_empty: if True, empty lines are skipped
+    @return: a generator yielding the normalized logs, in file order. The
+    file is read as the generator is consumed, and closed once it is done if
+    it was opened from a path."""
+    f = open_log(source)
+    try:
+        lines = read_lines(f, encoding, bufsize)
+        if skip_empty:
+            lines = ( line for line in lines if line )
+        for log in normalizer.normalize_batch({'raw' : line} for line in lines):
+            yield log
+    finally:
+        f.close()
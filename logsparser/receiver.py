@@ -0,0 +1,372 @@
+# -*- python -*-
+
+# pylogsparser - Logs parsers python library
+#
+# Copyright (C) 2011 Wallix Inc.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+#
+
+"""This module exposes the L{SyslogReceiver} class, a syslog server feeding
+a L{LogNormalizer}.
+
+Messages are received over UDP, and over TCP with either of the framings of
+RFC 6587 : octet counting ("LEN SP MSG") or a line feed after each message.
+Sockets are served by an asyncore event loop, which does nothing but read
+them and group messages into batches; the batches are normalized in worker
+threads, and the normalized logs handed over to a sink.
+
+When the workers or the sink fall behind, batches pile up in a bounded queue.
+Once it is full, TCP connections are not read anymore, which slows their
+senders down. UDP sockets are still read, so that the kernel buffer does not
+overflow, into a bounded buffer : datagrams are dropped, and counted, only
+once this buffer is full.
+
+Here an example :
+
+>>> from logsparser.lognormalizer import LogNormalizer
+>>> from logsparser.receiver import SyslogReceiver
+>>> def sink(logs):
+...     for log in logs:
+...         print log.get('program')
+>>> receiver = SyslogReceiver(LogNormalizer('/usr/local/share/normalizers'),
+...                           sink, udp = ('0.0.0.0', 514), tcp = ('0.0.0.0', 514))
+>>> receiver.serve_forever()
+"""
+
+import os
+import time
+import errno
+import socket
+import asyncore
+import warnings
+import threading
+from Queue import Queue, Full
+
+# the errors telling that there is nothing more to read for now
+_WOULDBLOCK = (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR)
+
+def decode(message):
+    """@return: a syslog message as a unicode string, without its trailing
+    line terminator."""
+    message = message.rstrip('\r\n\x00')
+    return message.decode('utf-8', 'replace')
+
+def split_frames(data, max_message = 65536):
+    """splits a TCP stream into syslog messages, as framed per RFC 6587. The
+    framing is guessed for each message : octet counting if it starts with a
+    digit, a line feed trailer otherwise. Frames announcing more than
+    max_message bytes are taken for line feed terminated messages, so that
+    no more than max_message bytes are ever waited for.
+    @param data: the bytes received and not yet split
+    @param max_message: the size above which a message is cut
+    @return: (messages, remaining bytes)"""
+    messages = []
+    start = 0
+    length = len(data)
+    while start < length:
+        if data[start].isdigit():
+            space = data.find(' ', start, start + 10)
+            if space > 0 and data[start:space].isdigit() and \
+               int(data[start:space]) <= max_message:
+                end = space + 1 + int(data[start:space])
+                if end > length:
+                    break
+                messages.append(data[space + 1:end])
+                start = end
+                continue
+        end = data.find('\n', start)
+        if end < 0:
+            if length - start > max_message:
+                messages.append(data[start:])
+                start = length
+            break
+        messages.append(data[start:end])
+        start = end + 1
+    return messages, data[start:]
+
+class _UDPServer(asyncore.dispatcher):
+    """Reads syslog datagrams."""
+
+    # the size of the kernel receive buffer asked for
+    RCVBUF = 4 << 20
+    # the maximum number of datagrams read at once, before the other sockets
+    # are served
+    READS = 1024
+
+    def __init__(self, receiver, address):
+        asyncore.dispatcher.__init__(self, map = receiver.map)
+        self.receiver = receiver
+        self.create_socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.RCVBUF)
+        except socket.error:
+            pass
+        self.bind(address)
+
+    def writable(self):
+        return False
+
+    def handle_connect(self):
+        pass
+
+    def handle_read(self):
+        push = self.receiver.push
+        for i in xrange(self.READS):
+            try:
+                data = self.socket.recv(65536)
+            except socket.error, e:
+                if e.args[0] in _WOULDBLOCK:
+                    return
+                raise
+            if data:
+                push(data)
+
+class _TCPConnection(asyncore.dispatcher):
+    """Reads syslog messages from a TCP connection."""
+
+    def __init__(self, receiver, sock):
+        asyncore.dispatcher.__init__(self, sock, map = receiver.map)
+        self.receiver = receiver
+        self.data = ''
+
+    def readable(self):
+        return not self.receiver.paused
+
+    def writable(self):
+        return False
+
+    def handle_read(self):
+        data = self.recv(65536)
+        if not data:
+            return
+        messages, self.data = split_frames(self.data + data,
+                                           self.receiver.max_message)
+        for message in messages:
+            if message:
+                self.receiver.push(message)
+
+    def handle_close(self):
+        if self.data.strip():
+            self.receiver.push(self.data)
+        self.data = ''
+        self.close()
+
+class _TCPServer(asyncore.dispatcher):
+    """Accepts syslog TCP connections."""
+
+    def __init__(self, receiver, address):
+        asyncore.dispatcher.__init__(self, map = receiver.map)
+        self.receiver = receiver
+        self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.set_reuse_addr()
+        self.bind(address)
+        self.listen(128)
+
+    def writable(self):
+        return False
+
+    def handle_accept(self):
+        pair = self.accept()
+        if pair is not None:
+            _TCPConnection(self.receiver, pair[0])
+
+class _Trigger(asyncore.file_dispatcher):
+    """Wakes the event loop up from another thread, through a pipe."""
+
+    def __init__(self, receiver):
+        self.receiver = receiver
+        r, self.w = os.pipe()
+        asyncore.file_dispatcher.__init__(self, r, map = receiver.map)
+        os.close(r)
+
+    def writable(self):
+        return False
+
+    def pull(self):
+        os.write(self.w, 'x')
+
+    def handle_read(self):
+        try:
+            self.recv(512)
+        except (OSError, socket.error):
+            pass
+        self.receiver._flush()
+
+    def close(self):
+        asyncore.file_dispatcher.close(self)
+        os.close(self.w)
+
+class SyslogReceiver(object):
+    """Syslog server normalizing the messages it receives.
+
+    The sink is a callable, given lists of normalized logs. It is called from
+    the worker threads : with several workers, it must be thread safe, and
+    batches may reach it out of order. A sink that blocks slows the receiver
+    down, as described in the module documentation."""
+
+    def __init__(self, normalizer, sink, udp = None, tcp = None,
+                 batch_size = 256, batch_delay = 0.1, workers = 1,
+                 max_batches = 16, max_buffer = 65536, max_message = 65536):
+        """
+        Binds the server sockets.
+
+        @param normalizer: the L{LogNormalizer} to apply. A
+        L{ParallelLogNormalizer} can be used too, with a single worker.
+        @param sink: the callable receiving the lists of normalized logs.
+        @param udp: the (host, port) address to receive datagrams on, if any.
+        @param tcp: the (host, port) address to accept connections on, if any.
+        @param batch_size: the number of messages normalized at once.
+        @param batch_delay: the maximum time a message waits for its batch to
+        be complete, in seconds.
+        @param workers: the number of worker threads.
+        @param max_batches: the number of batches waiting for a worker above
+        which TCP connections are not read anymore.
+        @param max_buffer: the number of messages waiting for their batch to
+        be queued above which datagrams are dropped.
+        @param max_message: the size above which a TCP message is cut.
+        """
+        if udp is None and tcp is None:
+            raise ValueError, "No address to listen to"
+        self.normalizer = normalizer
+        self.sink = sink
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.workers = workers
+        self.max_buffer = max_buffer
+        self.max_message = max_message
+        self.map = {}
+        self.batches = Queue(max_batches)
+        # the messages waiting for their batch to be queued, and the time the
+        # oldest of them was received at
+        self.buffer = []
+        self.since = None
+        # the number of messages received, and of datagrams dropped
+        self.received = 0
+        self.dropped = 0
+        self.running = False
+        self._threads = []
+        self._thread = None
+        self._udp = self._tcp = None
+        if udp is not None:
+            self._udp = _UDPServer(self, udp)
+        if tcp is not None:
+            self._tcp = _TCPServer(self, tcp)
+        self._trigger = _Trigger(self)
+
+    @property
+    def udp_address(self):
+        """the address datagrams are received on, or None."""
+        return self._udp and self._udp.socket.getsockname()
+
+    @property
+    def tcp_address(self):
+        """the address connections are accepted on, or None."""
+        return self._tcp and self._tcp.socket.getsockname()
+
+    @property
+    def paused(self):
+        """True when the batch queue is full and a batch is waiting."""
+        return len(self.buffer) >= self.batch_size
+
+    def push(self, message):
+        """buffers a received message.
+        @param message: the message, as bytes"""
+        if len(self.buffer) >= self.max_buffer:
+            self.dropped += 1
+            return
+        self.received += 1
+        if not self.buffer:
+            self.since = time.time()
+        self.buffer.append({'raw' : decode(message)})
+        if len(self.buffer) >= self.batch_size:
+            self._flush()
+
+    def _flush(self, partial = False, block = False):
+        """queues the buffered messages by batches, as long as the queue is not
+        full. The last, incomplete batch is queued only if partial is True."""
+        while self.buffer and (partial or len(self.buffer) >= self.batch_size):
+            batch = self.buffer[:self.batch_size]
+            try:
+                self.batches.put(batch, block)
+            except Full:
+                return
+            del self.buffer[:self.batch_size]
+            self.since = time.time()
+
+    def _work(self):
+        """The main loop of a worker thread."""
+        while True:
+            batch = self.batches.get()
+            if batch is None:
+                break
+            if self.paused:
+                # a batch is waiting for the room just made in the queue
+                self._trigger.pull()
+            try:
+                self.sink(list(self.normalizer.normalize_batch(batch)))
+            except Exception, e:
+                warnings.warn("Could not normalize a batch of %i logs : %s" %
+                              (len(batch), e))
+
+    def serve_forever(self):
+        """Serves the sockets until stop is called. The messages still buffered
+        are normalized before this method returns."""
+        self.running = True
+        self._serve()
+
+    def _serve(self):
+        self._threads = [ threading.Thread(target = self._work)
+                          for i in range(self.workers) ]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+        try:
+            while self.running:
+                asyncore.loop(min(self.batch_delay, 0.5), map = self.map,
+                              count = 1)
+                if self.buffer and time.time() - self.since >= self.batch_delay:
+                    self._flush(partial = True)
+        finally:
+            self._flush(partial = True, block = True)
+            for thread in self._threads:
+                self.batches.put(None)
+            for thread in self._threads:
+                thread.join()
+            self._threads = []
+            self.close()
+
+    def start(self):
+        """Serves the sockets in a background thread.
+        @return: the thread"""
+        # set here so that a stop right after start is not missed
+        self.running = True
+        self._thread = threading.Thread(target = self._serve)
+        self._thread.daemon = True
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        """Stops serving, once the messages buffered are normalized. If the
+        receiver was started with start, waits for its thread."""
+        self.running = False
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+            self._thread = None
+
+    def close(self):
+        """Closes the sockets."""
+        asyncore.close_all(self.map)
@@ -0,0 +1,271 @@
+# -*- python -*-
+
+# pylogsparser - Logs parsers python library
+#
+# Copyright (C) 2011 Wallix Inc.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+#
+
+"""This module exposes the L{Record} class, a compact replacement for the
+dictionaries holding normalized logs.
+
+A dictionary keeps a hash table per log, sized for the tags it holds. A record
+only keeps the list of its values : the tag names and their positions are
+kept in a L{Schema}, shared by every record holding the same tags, in the same
+order. Logs normalized by the same normalizers end up with the same tags, so
+that a handful of schemas serve any number of records.
+
+Records behave like dictionaries (get, [], in, keys, update, del ...), so that
+normalizers and their callbacks apply to them unchanged. Normalizing them is
+slower than normalizing dictionaries though, each of these operations being
+a python method call : LogNormalizer.normalize_batch converts the logs once
+normalized instead. Here an example :
+
+>>> from logsparser.lognormalizer import LogNormalizer
+>>> ln = LogNormalizer('/usr/local/share/normalizers/')
+>>> logs = list(ln.normalize_batch(({'raw' : line} for line in lines),
+...                                compact = True))
+>>> logs[0]['program']
+'/USR/SBIN/CRON'
+"""
+
+class Schema(object):
+    """The ordered tag names of records. Schemas are immutable : adding or
+    removing a tag gives another schema, looked up among the ones already
+    derived from this one."""
+
+    __slots__ = ('names', 'index', 'added', 'removed')
+
+    def __init__(self, names = ()):
+        """@param names: a tuple of tag names"""
+        self.names = names
+        self.index = dict([ (name, i) for i, name in enumerate(names) ])
+        # the schemas derived from this one, by tag name, created along with
+        # their first entry. They are only kept on the schemas of _schemas.
+        # Threads racing to derive a schema may each build their own copy,
+        # which is harmless.
+        self.added = None
+        self.removed = None
+
+    def add(self, name):
+        """@return: the schema with name appended to the names of this one."""
+        added = self.added
+        if added is not None:
+            schema = added.get(name)
+            if schema is not None:
+                return schema
+        if type(name) is str:
+            name = intern(name)
+        schema = get_schema(self.names + (name,))
+        if _schemas.get(self.names) is self:
+            if self.added is None:
+                self.added = {}
+            self.added[name] = schema
+        return schema
+
+    def remove(self, name):
+        """@return: the schema with the names of this one but name."""
+        removed = self.removed
+        if removed is not None:
+            schema = removed.get(name)
+            if schema is not None:
+                return schema
+        i = self.index[name]
+        schema = get_schema(self.names[:i] + self.names[i + 1:])
+        if _schemas.get(self.names) is self:
+            if self.removed is None:
+                self.removed = {}
+            self.removed[name] = schema
+        return schema
+
+# the maximum number of schemas kept in _schemas. Once it is reached, they are
+# all forgotten, along with the schemas derived from them, and the schemas
+# used from then on are cached again : schemas are shared as long as their
+# records are alive, and the memory taken by logs whose tag names come from
+# their content is bounded.
+MAX_SCHEMAS = 4096
+
+# the schemas by names
+_schemas = {}
+
+def get_schema(names):
+    """@param names: a tuple of tag names
+    @return: the schema of these names, shared with the records that were
+    given the same tags in the same order."""
+    schema = _schemas.get(names)
+    if schema is None:
+        if len(_schemas) >= MAX_SCHEMAS:
+            for old in _schemas.values():
+                old.added = old.removed = None
+            _schemas.clear()
+            _schemas[()] = EMPTY
+        schema = _schemas[names] = Schema(names)
+    return schema
+
+# the schema of empty records, all the others derive from
+EMPTY = _schemas[()] = Schema()
+
+def _rebuild(names, values):
+    """unpickles a L{Record}.
+    @param names: the tag names of the record
+    @param values: the values of the record, in the order of names"""
+    record = Record.__new__(Record)
+    record._schema = get_schema(names)
+    record._values = values
+    return record
+
+class Record(object):
+    """A normalized log, as a list of values along with their L{Schema}.
+
+    Records are built like dictionaries, from a mapping, from (key, value)
+    pairs or from keyword arguments. They are equal to the dictionaries
+    holding the same items, and dict(record) converts them back."""
+
+    __slots__ = ('_schema', '_values')
+
+    def __init__(self, data = (), **kwargs):
+        if type(data) is dict:
+            # the keys and values of an unmodified dictionary come in the same
+            # order
+            self._schema = get_schema(tuple(data.keys()))
+            self._values = data.values()
+        else:
+            self._schema = EMPTY
+            self._values = []
+            self.update(data)
+        if kwargs:
+            self.update(kwargs)
+
+    def __getitem__(self, key):
+        i = self._schema.index.get(key)
+        if i is None:
+            raise KeyError(key)
+        return self._values[i]
+
+    def __setitem__(self, key, value):
+        i = self._schema.index.get(key)
+        if i is None:
+            self._schema = self._schema.add(key)
+            self._values.append(value)
+        else:
+            self._values[i] = value
+
+    def __delitem__(self, key):
+        i = self._schema.index.get(key)
+        if i is None:
+            raise KeyError(key)
+        self._schema = self._schema.remove(key)
+        del self._values[i]
+
+    def __contains__(self, key):
+        return key in self._schema.index
+
+    has_key = __contains__
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._schema.names)
+
+    def get(self, key, default = None):
+        i = self._schema.index.get(key)
+        if i is None:
+            return default
+        return self._values[i]
+
+    def keys(self):
+        return list(self._schema.names)
+
+    def values(self):
+        return list(self._values)
+
+    def items(self):
+        return zip(self._schema.names, self._values)
+
+    def iterkeys(self):
+        return iter(self._schema.names)
+
+    def itervalues(self):
+        return iter(self._values)
+
+    def iteritems(self):
+        return iter(self.items())
+
+    def update(self, data = (), **kwargs):
+        if hasattr(data, 'keys'):
+            for key in data.keys():
+                self[key] = data[key]
+        else:
+            for key, value in data:
+                self[key] = value
+        for key, value in kwargs.iteritems():
+            self[key] = value
+
+    def pop(self, key, *default):
+        i = self._schema.index.get(key)
+        if i is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = self._values[i]
+        del self[key]
+        return value
+
+    def setdefault(self, key, default = None):
+        i = self._schema.index.get(key)
+        if i is None:
+            self[key] = default
+            return default
+        return self._values[i]
+
+    def clear(self):
+        self._schema = EMPTY
+        self._values = []
+
+    def copy(self):
+        record = Record()
+        record._schema = self._schema
+        record._values = list(self._values)
+        return record
+
+    def to_dict(self):
+        """@return: the items of this record, as a dictionary."""
+        return dict(zip(self._schema.names, self._values))
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict()
+        elif not isinstance(other, dict):
+            return NotImplemented
+        return self.to_dict() == other
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    # mutable, hence unhashable, as dictionaries
+    __hash__ = None
+
+    def __repr__(self):
+        return "Record(%r)" % self.to_dict()
+
+    def __reduce__(self):
+        # the names of a schema are pickled once for all the records sharing
+        # it, and the schema looked up again on unpickling
+        return (_rebuild, (self._schema.names, self._values))
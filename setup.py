@@ -46,6 +46,8 @@ setup(
     url = "http://www.wallix.org/pylogsparser-project/",
     package_dir={'logsparser.tests':'tests'}, 
     packages=['logsparser', 'logsparser.tests', 'logsparser.extras'],
+    package_data={'logsparser.extras': ['public_suffix_list.dat']},
+    scripts=['bin/logsparser-normalize'],
     data_files=[('share/logsparser/normalizers', data),
                 ('share/logsparser/i18n/fr_FR/LC_MESSAGES/', fr_trans),],
     requires=['lxml', 'pytz', 'dateutil'],
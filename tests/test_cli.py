@@ -0,0 +1,105 @@
+# -*- python -*-
+
+# pylogsparser - Logs parsers python library
+#
+# Copyright (C) 2011 Wallix Inc.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+#
+
+import os
+import re
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from StringIO import StringIO
+from logsparser.cli import main, Report
+
+class Test(unittest.TestCase):
+    """Unit tests for the logsparser-normalize command"""
+    normalizer_path = os.environ['NORMALIZERS_PATH']
+    lines = ["Jul 18 08:55:35 naruto sshd[3245]: Accepted password for bob from 10.0.0.1 port 4242 ssh2",
+             "nothing to see here",
+             "Jul 18 08:55:36 naruto sshd[3246]: Accepted password for alice from 10.0.0.2 port 4243 ssh2"]
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.input = os.path.join(self.tmpdir, 'input.log')
+        self.output = os.path.join(self.tmpdir, 'output.json')
+        open(self.input, 'w').write("\n".join(self.lines) + "\n")
+        self.stderr = sys.stderr
+
+    def tearDown(self):
+        sys.stderr = self.stderr
+        shutil.rmtree(self.tmpdir)
+
+    def run_main(self, *args):
+        sys.stderr = StringIO()
+        try:
+            status = main(['-n', self.normalizer_path, '-o', self.output, '-r', '0'] + list(args))
+        finally:
+            report, sys.stderr = sys.stderr.getvalue(), self.stderr
+        logs = []
+        if os.path.isfile(self.output):
+            logs = [ json.loads(l) for l in open(self.output) ]
+        return status, logs, report
+
+    def test_00_normalize(self):
+        """Verify that logs are written as JSON lines, and reported on"""
+        for workers in ('0', '2'):
+            status, logs, report = self.run_main('-w', workers, '-b', '1', self.input)
+            self.assertEqual(status, 0)
+            self.assertEqual([ log['raw'] for log in logs ], self.lines)
+            self.assertEqual([ log.get('user') for log in logs ], ['bob', None, 'alice'])
+            self.assertTrue(logs[0]['date'].endswith('-07-18T08:55:35'))
+            self.assertTrue(isinstance(logs[0]['uuid'], unicode))
+            self.assertTrue(int(logs[0]['uuid']) > 0)
+            self.assertTrue(report.startswith("3 logs, "))
+            self.assertTrue("33.3% unmatched" in report)
+            self.assertTrue("latency p50" in report)
+
+    def test_10_selection(self):
+        """Verify that normalizers can be selected"""
+        status, logs, report = self.run_main('-a', 'syslog', self.input)
+        self.assertEqual(status, 0)
+        self.assertEqual(logs[0]['program'], 'sshd')
+        self.assertFalse('user' in logs[0])
+        status, logs, report = self.run_main('-d', 'sshd', self.input)
+        self.assertFalse('user' in logs[0])
+        status, logs, report = self.run_main('-a', 'nosuchnormalizer', self.input)
+        self.assertEqual(status, 1)
+        self.assertTrue('nosuchnormalizer' in report)
+        status, logs, report = self.run_main(os.path.join(self.tmpdir, 'nosuchfile'))
+        self.assertEqual(status, 1)
+
+    def test_20_report(self):
+        """Verify that latency percentiles are kept in bounded memory"""
+        out = StringIO()
+        report = Report(out, 0)
+        log = {'raw' : 'a', 'uuid' : 'b', 'program' : 'c'}
+        for i in xrange(100000):
+            report.add(log, (i % 1000 + 1) / 1000.0)
+        self.assertTrue(len(report.latencies) < 200)
+        report.write(report.start + 1, final = True)
+        p50, p90, p99 = [ float(v) for v in
+                          re.findall(r"p\d+ ([\d.]+)ms", out.getvalue()) ]
+        for value, expected in ((p50, 501), (p90, 901), (p99, 991)):
+            self.assertTrue(expected <= value <= expected * 1.05)
+        self.assertTrue(out.getvalue().startswith("100000 logs, "))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,6 +20,20 @@
 #
 
 import logsparser.extras as extras
+from logsparser.extras.lru import LRUCache, memoize
+from logsparser.extras import load_suffix_list
+from logsparser.extras.robots import robots
+from logsparser.normalizer import Normalizer, CallbackFunction, LazyModule, country_code_by_address
+from logsparser.normalizer import extras as lazy_extras
+from lxml.etree import parse
+from datetime import datetime, timedelta
+import pytz
+import os
+import sys
+import time
+import subprocess
+import tempfile
+import threading
 import unittest
 
 class TestExtras(unittest.TestCase):
@@ -31,6 +45,253 @@ class TestExtras(unittest.TestCase):
         self.assertEquals(extras.get_domain("10.10.4.7"), "10.10.4.7")
         self.assertEquals(extras.get_domain("www.google.com"), "google.com")
         self.assertEquals(extras.get_domain("lucan.cs.purdue.edu"), "purdue.edu")
-        
+        self.assertEquals(extras.get_domain("bbc.co.uk"), "bbc.co.uk")
+        # wildcard and exception rules
+        self.assertEquals(extras.get_domain("www.foo.bar.ve"), "foo.bar.ve")
+        self.assertEquals(extras.get_domain("www.nic.ar"), "nic.ar")
+        self.assertEquals(extras.get_domain("www.city.metro.tokyo.jp"), "metro.tokyo.jp")
+        # unknown suffixes
+        self.assertEquals(extras.get_domain("host.corp.local"), "corp.local")
+        self.assertEquals(extras.get_domain("localhost"), "localhost")
+
+    def test_01_dates(self):
+        """Tests the parsing of dates in various formats."""
+        expected = datetime(2012, 12, 21, 7, 49, 2)
+        for date_format, value in (("MM/dd/YYYY hh:mm:ss", "12/21/2012 07:49:02"),
+                                   ("dd/MMM/YYYY:hh:mm:ss", "21/Dec/2012:07:49:02"),
+                                   ("MMM dd YYYY hh:mm:ss", "Dec 21 2012 07:49:02"),
+                                   ("DDD MMM dd hh:mm:ss YYYY", "Fri Dec 21 07:49:02 2012"),
+                                   ("YYYY-MM-DD hh:mm:ss", "2012-12-21 07:49:02"),
+                                   ("MM/DD/YY, hh:mm:ss", "12/21/12, 7:49:02"),
+                                   ("YYMMDD hh:mm:ss", "121221  7:49:02"),
+                                   ("ISO8601", "2012-12-21T07:49:02Z"),
+                                   ("EPOCH", "1356076142"),
+                                   ("dd-MMM-YYYY hh:mm:ss", "21-Dec-2012 07:49:02")):
+            self.assertEquals(extras.parse_date(date_format, value), expected)
+            # twice, to hit the cache
+            self.assertEquals(extras.parse_date(date_format, value), expected)
+        self.assertEquals(extras.parse_date("ISO8601", "2012-12-21T07:49:02.123Z"),
+                          datetime(2012, 12, 21, 7, 49, 2, 123000))
+        self.assertRaises(ValueError, extras.parse_date, "MM/dd/YYYY hh:mm:ss", "not a date")
+        # syslog dates are never set more than a minute in the future
+        now = datetime.now()
+        past = now - timedelta(days = 1)
+        future = now + timedelta(days = 1)
+        self.assertEquals(extras.parse_syslog_date(past.strftime("%b %d %H:%M:%S")).year,
+                          past.year)
+        if future.year == now.year:
+            self.assertEquals(extras.parse_syslog_date(future.strftime("%b %d %H:%M:%S")).year,
+                              now.year - 1)
+
+    def test_02_lru(self):
+        """Tests the LRU cache."""
+        cache = LRUCache(2)
+        cache['a'] = 1
+        cache['b'] = 2
+        self.assertEquals(cache.get('a'), 1)
+        cache['c'] = 3
+        self.assertEquals(len(cache), 2)
+        self.assertFalse('b' in cache)
+        self.assertEquals(cache['a'], 1)
+        self.assertEquals(cache['c'], 3)
+        self.assertRaises(KeyError, cache.__getitem__, 'b')
+        calls = []
+        @memoize(10)
+        def square(x):
+            calls.append(x)
+            return x * x
+        self.assertEquals(square(3), 9)
+        self.assertEquals(square(3), 9)
+        self.assertEquals(calls, [3])
+        # lookups do not wait for the lock
+        cache.lock.acquire()
+        try:
+            self.assertEquals(cache.get('a'), 1)
+        finally:
+            cache.lock.release()
+        # the cache stays consistent when threads race
+        cache = LRUCache(50)
+        def fill(n):
+            for i in xrange(2000):
+                key = (i * n) % 120
+                if cache.get(key) is None:
+                    cache[key] = key
+        threads = [ threading.Thread(target = fill, args = (n,)) for n in (1, 7, 13, 31) ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEquals(len(cache), 50)
+        self.assertTrue(all([ cache.get(k) == k for k in cache.map.keys() ]))
+
+    def test_03_timezones(self):
+        """Tests the conversion of dates to UTC around DST transitions."""
+        def reference(date, from_tz):
+            timezone = pytz.timezone(from_tz)
+            return timezone.localize(date).astimezone(pytz.utc).replace(tzinfo = None)
+        dates = []
+        date = datetime(2012, 3, 24, 23, 51, 12)
+        while date < datetime(2012, 3, 26):
+            dates.append(date)
+            date += timedelta(minutes = 13)
+        date = datetime(2012, 10, 27, 23, 51, 12)
+        while date < datetime(2012, 10, 29):
+            dates.append(date)
+            date += timedelta(minutes = 13)
+        for tz in ('Europe/Paris', 'America/New_York', 'Australia/Lord_Howe'):
+            expected = [ reference(d, tz) for d in dates ]
+            self.assertEquals([ extras.to_naive_utc(d, tz) for d in dates ], expected)
+            self.assertEquals(extras.to_naive_utc_batch(dates, tz), expected)
+        self.assertEquals(extras.to_naive_utc(dates[0], 'Nowhere/Special'), dates[0])
+
+    def test_04_iso8601(self):
+        """Tests the parsing of ISO 8601 dates to naive UTC datetimes."""
+        expected = datetime(2012, 12, 21, 7, 49, 2)
+        for value in ("2012-12-21T07:49:02Z",
+                      "2012-12-21T07:49:02",
+                      "2012-12-21 07:49:02",
+                      "2012-12-21T08:49:02+01:00",
+                      "2012-12-21T08:49:02+0100",
+                      "2012-12-21T02:19:02-05:30",
+                      "Dec 21 2012 07:49:02"):
+            self.assertEquals(extras.iso_to_utc(value), expected)
+        self.assertEquals(extras.iso_to_utc("2012-12-21T07:49:02.123456789Z"),
+                          datetime(2012, 12, 21, 7, 49, 2, 123456))
+        self.assertEquals(extras.iso_to_utc("2012-12-21T07:49:02,5Z"),
+                          datetime(2012, 12, 21, 7, 49, 2, 500000))
+        self.assertEquals(extras.iso_to_utc("2012-12-21"), datetime(2012, 12, 21))
+        self.assertRaises(ValueError, extras.iso_to_utc, "not a date")
+
+    def test_05_suffix_list(self):
+        """Tests loading an updated public suffix list."""
+        fd, path = tempfile.mkstemp()
+        os.write(fd, "// a comment\n\ncom\nexample.com\n")
+        os.close(fd)
+        try:
+            self.assertEquals(extras.get_domain("www.foo.example.com"), "example.com")
+            load_suffix_list(path)
+            self.assertEquals(extras.get_domain("www.foo.example.com"), "foo.example.com")
+            self.assertEquals(extras.get_domain("bbc.co.uk"), "co.uk")
+        finally:
+            os.unlink(path)
+            load_suffix_list()
+        self.assertEquals(extras.get_domain("bbc.co.uk"), "bbc.co.uk")
+
+    def test_06_robots(self):
+        """Tests the classification of user agents."""
+        self.assertEquals(extras.find_robot("Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"),
+                          "googlebot")
+        self.assertEquals(extras.find_robot("TurtleScanner/1.0"), "turtlescanner")
+        self.assertEquals(extras.find_robot("Mozilla/5.0 (X11; Linux x86_64; rv:10.0) Gecko/20100101 Firefox/10.0"),
+                          None)
+        saved = list(robots)
+        fd, path = tempfile.mkstemp()
+        os.write(fd, "# more robots\nFoobot\n\nfoo\n")
+        os.close(fd)
+        normalizers = os.environ['NORMALIZERS_PATH']
+        useragent = Normalizer(parse(open(os.path.join(normalizers, 'UserAgent.xml'))),
+                               os.path.join(normalizers, 'common_tagTypes.xml'),
+                               os.path.join(normalizers, 'common_callBacks.xml'))
+        regex = CallbackFunction("log['bot'] = bool(extras.robot_regex.search(value))", 'bot')
+        log = useragent.normalize({'useragent' : u"Mozilla/5.0 (compatible; FooBot/1.0)"})
+        self.assertFalse('search_engine_bot' in log)
+        regex(u"FooBot/1.0", log)
+        self.assertFalse(log['bot'])
+        try:
+            extras.load_robots(path)
+            # callbacks see the robots loaded
+            log = useragent.normalize({'useragent' : u"Mozilla/5.0 (compatible; FooBot/1.0)"})
+            self.assertEquals(log['search_engine_bot'], "foobot")
+            regex(u"FooBot/1.0", log)
+            self.assertTrue(log['bot'])
+            self.assertEquals(extras.find_robot("Mozilla/5.0 (compatible; FooBot/1.0)"), "foobot")
+            self.assertEquals(extras.find_robot("a Foo spider"), "foo")
+            self.assertEquals(extras.find_robot("Googlebot/2.1"), "googlebot")
+            self.assertTrue(extras.robot_regex.search("Mozilla/5.0 (compatible; FooBot/1.0)"))
+            self.assertTrue(extras.robot_regex.search("Googlebot/2.1"))
+            extras.load_robots(path, extend = False)
+            self.assertEquals(extras.find_robot("Googlebot/2.1"), None)
+            self.assertFalse(extras.robot_regex.search("Googlebot/2.1"))
+            self.assertTrue(extras.robot_regex.search("a Foo spider"))
+        finally:
+            open(path, "w").write("\n".join(saved))
+            extras.load_robots(path, extend = False)
+            os.unlink(path)
+        self.assertEquals(robots, saved)
+
+    def test_07_geoip(self):
+        """Tests country lookups in a CSV database of ranges."""
+        fd, path = tempfile.mkstemp()
+        os.write(fd, '"1.0.0.0","1.0.0.255","16777216","16777471","AU","Australia"\n'
+                     '"2.0.0.0","2.15.255.255","33554432","34603007","FR","France"\n')
+        os.close(fd)
+        try:
+            extras.load_country_database(path)
+            self.assertEquals(extras.country_code_by_address("2.3.4.5"), "FR")
+            self.assertEquals(extras.country_code_by_address("1.0.0.255"), "AU")
+            self.assertEquals(extras.country_code_by_address("1.0.1.0"), None)
+            self.assertEquals(extras.country_code_by_address("0.1.2.3"), None)
+            self.assertEquals(extras.country_code_by_address("not an IP"), None)
+            self.assertEquals(extras.country_codes(["2.0.0.0", "1.0.0.1", "2.0.0.0", "10.0.0.1"]),
+                              ["FR", "AU", "FR", None])
+            open(path, 'w').write("10.0.0.0,10.255.255.255,ZZ\n")
+            extras.load_country_database(path)
+            self.assertEquals(extras.country_codes(["10.1.2.3", "2.3.4.5"]), ["ZZ", None])
+        finally:
+            os.unlink(path)
+            extras.load_country_database()
+
+    def test_08_filetime(self):
+        """Tests the conversion of windows timestamps."""
+        expected = datetime(2012, 9, 25, 5, 23, 32, 123456)
+        self.assertEquals(extras.filetime_to_datetime(129930242121234567), expected)
+        self.assertEquals(extras.filetime_to_datetime("129930242121234567"), expected)
+        self.assertEquals(extras.filetime_to_datetime(0), datetime(1601, 1, 1))
+        self.assertEquals(extras.filetime_to_datetime_batch(["129930242121234567", 0]),
+                          [expected, datetime(1601, 1, 1)])
+        self.assertRaises(ValueError, extras.filetime_to_datetime, "never")
+
+    def test_09_filetime_eventlog(self):
+        """Tests the conversion of windows timestamps in eventlogs, whatever the
+        local timezone."""
+        path = os.environ['NORMALIZERS_PATH']
+        normalizer = Normalizer(parse(open(os.path.join(path, 'eventlog_security_audit_windows2008_en_2.xml'))),
+                                os.path.join(path, 'common_tagTypes.xml'),
+                                os.path.join(path, 'common_callBacks.xml'))
+        raw = [ e.raw_line for p in normalizer.patterns.values() for e in p.examples
+                if 'Password Last Set: <never>' in e.raw_line ][0]
+        raw = raw.replace('Password Last Set: <never>',
+                          'Password Last Set: 129930242121234567')
+        tz = os.environ.get('TZ')
+        os.environ['TZ'] = 'America/New_York'
+        time.tzset()
+        try:
+            log = normalizer.normalize({normalizer.appliedTo : raw})
+            self.assertEquals(extras.winUTC2UnixTimestamp(129930242121234567),
+                              '2012-09-25T05:23:32')
+        finally:
+            if tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = tz
+            time.tzset()
+        self.assertEquals(log['password_last_set'], datetime(2012, 9, 25, 5, 23, 32, 123456))
+        self.assertEquals(log['expiry_date'], '<never>')
+
+    def test_10_lazy_extras(self):
+        """Tests that extras are only imported when a callback needs them."""
+        check = subprocess.Popen([sys.executable, '-c',
+                                  "import sys, logsparser.normalizer; "
+                                  "print [ m for m in ('logsparser.extras', 'pytz', 'GeoIP') "
+                                  "if m in sys.modules ]"],
+                                 stdout = subprocess.PIPE)
+        self.assertEqual(check.communicate()[0].strip(), '[]')
+        cb = CallbackFunction("log['domain'] = extras.get_domain(value)", 'domain')
+        log = {}
+        cb("www.google.com", log)
+        self.assertEqual(log['domain'], "google.com")
+        self.assertTrue(isinstance(lazy_extras, LazyModule))
+        self.assertEqual(country_code_by_address('127.0.0.1'), None)
+
 if __name__ == "__main__":
     unittest.main()
@@ -23,6 +23,7 @@ import os
 import unittest
 import tempfile
 import shutil
+import threading
 from logsparser.lognormalizer import LogNormalizer
 from lxml.etree import parse, fromstring as XMLfromstring
 
@@ -166,5 +167,212 @@ class Test(unittest.TestCase):
         self.assertEquals(XMLfromstring(ln.get_normalizer_source('postfix-1.0')).getroottree().getroot().get('version'), '1.0')
         shutil.rmtree(fdir)
 
+    def test_010_normalize_batch(self):
+        """ Verify that batch normalization gives the same results as
+        normalizing logs one by one.
+        """
+        from uuid import UUID
+        ln = LogNormalizer(self.normalizer_path)
+        lines = ['Jul 18 08:55:35 naruto app[3245]: body message',
+                 'Jul 18 08:55:35 naruto sshd[3245]: Accepted password for bob from 10.0.0.1 port 4242 ssh2',
+                 'a minimal log line']
+        expected = []
+        for line in lines:
+            log = {'raw': line}
+            ln.lognormalize(log)
+            del log['uuid']
+            expected.append(log)
+        # batches can be any iterable, including generators
+        results = list(ln.normalize_batch({'raw': line} for line in lines))
+        self.assertEqual(len(results), len(lines))
+        uuids = set()
+        for log, exp in zip(results, expected):
+            uuids.add(log['uuid'])
+            self.assertEqual(UUID(int = log['uuid']).version, 4)
+            del log['uuid']
+            self.assertEqual(log, exp)
+        self.assertEqual(len(uuids), len(lines))
+
+    def test_011_dispatch_index(self):
+        """ Verify that normalizers are indexed by input field, in the
+        order of priority, and that a field produced by a normalizer
+        triggers the normalizers applied to it.
+        """
+        ln = LogNormalizer(self.normalizer_path)
+        fields = [stage.field for stage in ln._dispatch]
+        self.assertEqual(fields[:2], ['raw', 'body'])
+        self.assertEqual(len(fields), len(set(fields)))
+        self.assertEqual(sum([stage.normalizers for stage in ln._dispatch], []), ln._cache)
+        testlog = {'raw': 'Jul 18 08:55:35 naruto sshd[3245]: Accepted password for bob from 10.0.0.1 port 4242 ssh2'}
+        ln.lognormalize(testlog)
+        self.assertEqual(testlog['program'], 'sshd')
+        self.assertEqual(testlog['user'], 'bob')
+        self.assertEqual(testlog['source_ip'], '10.0.0.1')
+        # a log without any raw field skips the raw normalizers altogether
+        testlog = {'body': 'Accepted password for bob from 10.0.0.1 port 4242 ssh2',
+                   'program': 'sshd'}
+        ln.lognormalize(testlog)
+        self.assertFalse('date' in testlog)
+        self.assertEqual(testlog['user'], 'bob')
+
+    def test_012_program_index(self):
+        """ Verify that normalizers gated on the program name are only
+        applied to logs from a matching program.
+        """
+        ln = LogNormalizer(self.normalizer_path)
+        body = [stage for stage in ln._dispatch if stage.field == 'body'][0]
+        def names(program):
+            return [norm.name for pos, norm, checked in body.get_normalizers(program)]
+        self.assertTrue('LEA' in names('lea'))
+        self.assertFalse('LEA' in names('sshd'))
+        self.assertFalse('netfilter' in names('sshd'))
+        # prerequisites are regular expressions matched from the start
+        self.assertTrue('postfix' in names('postfix/smtpd'))
+        self.assertFalse('postfix' in names('postfix'))
+        self.assertTrue('sshd' in names('lea'))
+        self.assertTrue('sshd' in names(''))
+        # relative order is kept
+        order = [norm.name for norm in body.normalizers]
+        positions = [order.index(n) for n in names('kernel')]
+        self.assertEqual(positions, sorted(positions))
+        testlog = {'raw' : 'Dec 21 07:49:04 hosting03 postfix/smtpd[23446]: C43971B4019: client=paris.office.wallix.com[82.238.42.70]'}
+        ln.lognormalize(testlog)
+        self.assertEqual(testlog['program'], 'postfix')
+        self.assertEqual(testlog['component'], 'smtpd')
+
+    def test_013_first_match(self):
+        """ Verify that the merged engine normalizes logs like the default
+        engine.
+        """
+        ln = LogNormalizer(self.normalizer_path)
+        fm = LogNormalizer(self.normalizer_path, first_match = True)
+        samples = ['<29>Jul 18 08:55:35 naruto squid[3245]: 1259844091.407    307 82.238.42.70 TCP_MISS/200 1015 GET http://www.ietf.org/css/ietf.css fbo DIRECT/64.170.98.32 text/css',
+                   'Dec 21 07:49:04 hosting03 postfix/smtpd[23446]: C43971B4019: client=paris.office.wallix.com[82.238.42.70]',
+                   '<40>Dec 21 07:49:02 naruto sshd[2344]: Accepted password for fbo from 192.168.1.1 port 36530 ssh2',
+                   'Jul 18 08:55:35 naruto dhcpd: DHCPDISCOVER from 02:1c:25:a3:32:76 via 183.213.184.122']
+        for raw in samples:
+            l1 = {'raw' : raw}
+            l2 = {'raw' : raw}
+            ln.lognormalize(l1)
+            fm.lognormalize(l2)
+            del l1['uuid'], l2['uuid']
+            self.assertEqual(l1, l2)
+        body = [stage for stage in fm._dispatch if stage.field == 'body'][0]
+        engine = body.get_engine('sshd')
+        self.assertTrue([merged for merged, members, offsets in engine.chunks
+                         if merged and len(members) > 1])
+
+    def test_014_common_library(self):
+        """ Verify that the common library is loaded once, and reloaded when
+        its files change.
+        """
+        fdir = tempfile.mkdtemp()
+        for f in ('normalizer.dtd', 'common_tagTypes.xml', 'common_callBacks.xml',
+                  'syslog.xml', 'sshd.xml'):
+            shutil.copyfile(os.path.join(self.normalizer_path, f),
+                            os.path.join(fdir, f))
+        ln = LogNormalizer(fdir)
+        common = ln.common
+        for norm in ln._cache:
+            self.assertTrue(norm.genericTagTypes is common.tagTypes)
+            self.assertTrue(norm.genericCallBacks is common.callBacks)
+        ln.reload()
+        self.assertTrue(ln.common is common)
+        ccb = os.path.join(fdir, 'common_callBacks.xml')
+        os.utime(ccb, (os.stat(ccb).st_atime, os.stat(ccb).st_mtime + 10))
+        ln.reload()
+        self.assertFalse(ln.common is common)
+        self.assertTrue(ln._cache[0].genericCallBacks is ln.common.callBacks)
+        shutil.rmtree(fdir)
+
+    def test_015_bundle(self):
+        """ Verify that normalizers are loaded back from a compiled bundle
+        until their definitions change.
+        """
+        fdir = tempfile.mkdtemp()
+        for f in ('normalizer.dtd', 'common_tagTypes.xml', 'common_callBacks.xml',
+                  'syslog.xml', 'sshd.xml', 'MSExchange2007MessageTracking.xml'):
+            shutil.copyfile(os.path.join(self.normalizer_path, f),
+                            os.path.join(fdir, f))
+        bundle = os.path.join(fdir, '.normalizers.bundle')
+        ln = LogNormalizer(fdir, bundle = True)
+        self.assertTrue(os.path.isfile(bundle))
+        ln2 = LogNormalizer(fdir, bundle = True)
+        self.assertEqual(sorted([n.uuid for n in ln._cache]),
+                         sorted([n.uuid for n in ln2._cache]))
+        for raw in ['<40>Dec 21 07:49:02 naruto sshd[2344]: Accepted password for fbo from 192.168.1.1 port 36530 ssh2',
+                    '2010-04-19T12:29:07.390Z,10.10.10.1,WIN2K3DC,,WIN2K3DC,"MDB:ada3d2c3-6f32-45db-b1ee-a68dbcc86664, Mailbox:68cf09c1-1344-4639-b013-3c6f8a588504, Event:1440, MessageClass:IPM.Note, CreationTime:2010-04-19T12:28:51.312Z, ClientType:User",,STOREDRIVER,SUBMIT,,<C6539E897AEDFA469FE34D029FB708D43495@win2k3dc.qa.ifr.lan>,,,,,,,Coucou !,user7@qa.ifr.lan,,']:
+            l1 = {'raw' : raw}
+            l2 = {'raw' : raw}
+            ln.lognormalize(l1)
+            ln2.lognormalize(l2)
+            del l1['uuid'], l2['uuid']
+            self.assertEqual(l1, l2)
+        # a new definition invalidates the bundle
+        xml = parse(os.path.join(fdir, 'sshd.xml'))
+        xml.getroot().set('version', '4.2')
+        xml.write(os.path.join(fdir, 'sshd.xml'))
+        ln3 = LogNormalizer(fdir, bundle = True)
+        self.assertTrue('sshd-4.2' in [n.uuid for n in ln3._cache])
+        self.assertTrue('sshd-4.2' in [n.uuid for n in LogNormalizer(fdir, bundle = True)._cache])
+        shutil.rmtree(fdir)
+
+    def test_016_threads(self):
+        """ Verify that logs can be normalized by several threads while
+        normalizers are activated and deactivated.
+        """
+        ln = LogNormalizer(self.normalizer_path)
+        raw = 'Jul 18 08:55:35 naruto sshd[3245]: Accepted password for bob from 10.0.0.1 port 4242 ssh2'
+        expected = {'raw' : raw}
+        ln.lognormalize(expected)
+        del expected['uuid']
+        errors = []
+        def normalize():
+            try:
+                for i in range(20):
+                    for log in ln.normalize_batch({'raw' : raw} for j in range(50)):
+                        del log['uuid']
+                        # sshd is applied to the body, if syslog was active
+                        if 'body' in log and log != expected:
+                            errors.append(log)
+            except Exception, e:
+                errors.append(e)
+        threads = [ threading.Thread(target = normalize) for i in range(4) ]
+        for t in threads:
+            t.start()
+        active = ln.get_active_normalizers()
+        while [ t for t in threads if t.isAlive() ]:
+            active['syslog-1.0'] = not active['syslog-1.0']
+            ln.set_active_normalizers(active)
+            ln.reload()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+
+    def test_017_first_match_examples(self):
+        """ Verify that the merged engine normalizes the examples of every
+        normalizer like the default engine, wrapped in syslog or not.
+        """
+        ln = LogNormalizer(self.normalizer_path)
+        fm = LogNormalizer(self.normalizer_path, first_match = True)
+        logs = []
+        for norm in sum(ln.normalizers.values(), []):
+            for pattern in norm.patterns.values():
+                for example in pattern.examples:
+                    logs.append({norm.appliedTo : example.raw_line})
+                    logs.append({'raw' : "<29>Jul 18 08:55:35 naruto " + example.raw_line})
+                    if norm.appliedTo != 'raw':
+                        logs.append({'raw' : example.raw_line})
+        def normalize(normalizer, log):
+            log = dict(log)
+            try:
+                normalizer.lognormalize(log)
+            except Exception, e:
+                return str(e)
+            del log['uuid']
+            return log
+        for log in logs:
+            self.assertEqual(normalize(fm, log), normalize(ln, log))
+
 if __name__ == "__main__":
     unittest.main()
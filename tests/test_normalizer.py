@@ -20,12 +20,51 @@
 #
 
 import os
+import re
+import csv
 import unittest
+import warnings
+import pickle
+import threading
 from datetime import datetime
 from logsparser.normalizer import Normalizer, TagType, Tag, CallbackFunction, CSVPattern, get_generic_tagTypes
+from logsparser.normalizer import get_required_literals, MergedNormalizer
 from lxml.etree import parse, DTD
 from StringIO import StringIO
 
+# a normalizer tagging a user, with a tag type of its own
+LOGIN_NORMALIZER = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE normalizer SYSTEM "normalizer.dtd">
+<normalizer name="%(name)s" version="0.99" unicode="yes" ignorecase="no"
+            matchtype="match" appliedTo="raw">
+ <description><localized_desc language="en">Login</localized_desc></description>
+ <authors><author>mhu@wallix.com</author></authors>
+ <tagTypes>
+  <tagType name="Word" type="basestring">
+   <description><localized_desc language="en">A word</localized_desc></description>
+   <regexp>%(regexp)s</regexp>
+  </tagType>
+ </tagTypes>
+ <patterns>
+  <pattern name="%(name)s-001">
+   <description><localized_desc language="en">Login</localized_desc></description>
+   <text>%(text)s</text>
+   <tags>
+    <tag name="user" tagType="Word">
+     <description><localized_desc language="en">the user</localized_desc></description>
+     <substitute>USER</substitute>
+    </tag>
+   </tags>
+   <examples>
+    <example>
+     <text>%(example)s</text>
+     <expectedTags><expectedTag name="user">bob</expectedTag></expectedTags>
+    </example>
+   </examples>
+  </pattern>
+ </patterns>
+</normalizer>"""
+
 class TestSample(unittest.TestCase):
     """Unit tests for logsparser.normalize. Validate sample log example"""
     normalizer_path = os.environ['NORMALIZERS_PATH']
@@ -343,6 +382,72 @@ log["date"] = newdate
         self.assertEqual(ret['id'], '83')
         self.assertEqual(ret['msg'], 'start listening on =127.0.0.1 pam auth started')
 
+    def test_normalize_csv_pattern_007(self):
+        """Testing that lines are split as the csv module would"""
+        t1 = Tag(name='date',
+                tagtype = 'SyslogDate',
+                substitute = 'DATE')
+        t2 = Tag(name='id',
+                tagtype = 'Anything',
+                substitute = 'ID')
+        t3 = Tag(name='msg',
+                tagtype = 'Anything',
+                substitute = 'MSG')
+
+        p_tags = {}
+        for t in (t1, t2, t3):
+            p_tags[t.name] = t
+
+        p = CSVPattern('test', 'DATE,ID,MSG', tags = p_tags, tagTypes = self.tag_types, genericTagTypes = self.generic_tagTypes)
+        for line in ('Jul 18 08:55:35,83,start',
+                     'Jul 18 08:55:35,,"start, then stop"',
+                     u'Jul 18 08:55:35,83,start',
+                     u'Jul 18 08:55:35,83,d\xe9marrage',
+                     'Jul 18 08:55:35,83,"start\nstop"',
+                     'Jul 18 08:55:35,83,"start',
+                     'Jul 18 08:55:35,83\0,start',
+                     ''):
+            try:
+                expected = [row for row in csv.reader([line])][0]
+            except Exception:
+                expected = None
+            self.assertEqual(p.split(line), expected or None)
+        lines = ['Jul 18 08:55:35,83,start',
+                 'Jul 18 08:55:35,83',
+                 'Jul 18 08:55,83,start',
+                 'Jul 18 08:55:35,,"start, then stop"',
+                 'Jul 18 08:55:35,83,"start',
+                 u'Jul 18 08:55:35,84,"start, then stop"',
+                 None]
+        ret = list(p.normalize_batch(lines))
+        self.assertEqual(ret[0], {'date' : 'Jul 18 08:55:35', 'id' : '83', 'msg' : 'start'})
+        self.assertEqual(ret[1], None)
+        self.assertEqual(ret[2], None)
+        self.assertEqual(ret[3], {'date' : 'Jul 18 08:55:35', 'msg' : 'start, then stop'})
+        # an unclosed quote does not swallow the next line
+        self.assertEqual(ret[4]['msg'], 'start')
+        self.assertEqual(ret[5]['id'], '84')
+        self.assertEqual(ret, [ p.normalize(line) for line in lines ])
+
+    def test_normalize_csv_pattern_008(self):
+        """Testing that lines can be split by several threads at once"""
+        p = CSVPattern('test', 'DATE,ID,MSG', tags = {}, tagTypes = self.tag_types, genericTagTypes = self.generic_tagTypes)
+        errors = []
+        def split(i):
+            line = 'Jul 18 08:55:35,%i,"start, then stop %i"' % (i, i)
+            for j in range(2000):
+                if p.split(line) != ['Jul 18 08:55:35', str(i), 'start, then stop %i' % i]:
+                    errors.append(line)
+        threads = [ threading.Thread(target = split, args = (i,)) for i in range(4) ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        # readers are not pickled
+        p2 = pickle.loads(pickle.dumps(p))
+        self.assertEqual(p2.split('a,"b,c",d'), ['a', 'b,c', 'd'])
+
 
 class TestCommonElementsPrecedence(unittest.TestCase):
     """Unit test used to validate that callbacks defined in a normalizer
@@ -541,5 +646,130 @@ log['b'] = value * 2
         self.assertTrue(normalizer.validate())
 
 
+class TestCallbacks(unittest.TestCase):
+    """Unit tests for the resolution of tag callbacks"""
+
+    def test_00_missing_callback(self):
+        """Testing that missing callbacks are reported at load time"""
+        tag = Tag(name = 'date', tagtype = 'Anything', substitute = 'DATE',
+                  callbacks = ['nosuchcallback', 'formatsyslogdate'])
+        cb = CallbackFunction("log['date'] = value.upper()", 'formatsyslogdate')
+        self.assertEqual(tag.resolve_callbacks({cb.name : cb}), ['nosuchcallback'])
+        self.assertEqual(tag.callbackFunctions, (cb,))
+        warnings.simplefilter('error')
+        try:
+            self.assertRaises(UserWarning, CSVPattern, 'test', 'DATE,ID', tags = {'date' : tag})
+        finally:
+            warnings.resetwarnings()
+
+
+class TestPrefilter(unittest.TestCase):
+    """Unit tests for the literal prefilter of normalizers"""
+
+    normalizer_path = os.environ['NORMALIZERS_PATH']
+
+    def test_00_required_literals(self):
+        """Testing the extraction of required literals"""
+        self.assertEqual(get_required_literals(r"(?P<tag0>\d+) CMD (?:foo)? bar(baz)x{2}"),
+                         [' CMD ', ' bar', 'baz', 'x'])
+        self.assertEqual(get_required_literals(r"Accepted (?:password|publickey)", re.IGNORECASE),
+                         ['accepted ', 'p'])
+        self.assertEqual(get_required_literals(r"(?:a|b)+.*"), [])
+
+    def test_10_prefilter(self):
+        """Testing that the prefilter does not reject matching logs"""
+        n = parse(open(os.path.join(self.normalizer_path, 'sshd.xml')))
+        normalizer = Normalizer(n, os.path.join(self.normalizer_path, 'common_tagTypes.xml'),
+                                   os.path.join(self.normalizer_path, 'common_callBacks.xml'))
+        self.assertTrue(normalizer.prefilter)
+        self.assertFalse(normalizer.matches_prefilter(u"(root) CMD (/srv/git/redmine-changesets.sh)"))
+        self.assertTrue(normalizer.matches_prefilter(u"Accepted password for bob FROM 10.0.0.1 port 4242 ssh2"))
+        self.assertTrue(normalizer.validate())
+        log = normalizer.normalize({'body' : u"(root) CMD (/srv/git/redmine-changesets.sh)"})
+        self.assertFalse('user' in log)
+
+    def test_20_inline_flags(self):
+        """Testing that the prefilter follows the inline flags of tag types"""
+        n = parse(StringIO(LOGIN_NORMALIZER % {'name' : 'login', 'regexp' : '(?i)[a-z]+',
+                                               'text' : 'Login from USER',
+                                               'example' : 'LOGIN FROM bob'}))
+        normalizer = Normalizer(n, os.path.join(self.normalizer_path, 'common_tagTypes.xml'),
+                                   os.path.join(self.normalizer_path, 'common_callBacks.xml'))
+        self.assertTrue(normalizer.full_regexp.match(u"LOGIN FROM bob"))
+        self.assertTrue(normalizer.matches_prefilter(u"LOGIN FROM bob"))
+        self.assertFalse(normalizer.matches_prefilter(u"Logout from bob"))
+        self.assertEqual(normalizer.normalize({'raw' : u"LOGIN FROM bob"})['user'], u"bob")
+        self.assertTrue(normalizer.validate())
+
+class TestMergedNormalizer(unittest.TestCase):
+    """Unit tests for the merging of normalizers"""
+
+    normalizer_path = os.environ['NORMALIZERS_PATH']
+
+    def get_normalizer(self, **kwargs):
+        n = parse(StringIO(LOGIN_NORMALIZER % kwargs))
+        return Normalizer(n, os.path.join(self.normalizer_path, 'common_tagTypes.xml'),
+                             os.path.join(self.normalizer_path, 'common_callBacks.xml'))
+
+    def test_00_inline_flags(self):
+        """Testing that inline flags do not leak to the other members"""
+        insensitive = self.get_normalizer(name = 'login', regexp = '(?i)[a-z]+',
+                                          text = 'Login from USER',
+                                          example = 'LOGIN FROM bob')
+        sensitive = self.get_normalizer(name = 'logout', regexp = '[a-z]+',
+                                        text = 'Logout by USER',
+                                        example = 'Logout by bob')
+        merged = MergedNormalizer([insensitive, sensitive])
+        log = {'raw' : u"LOGOUT BY bob"}
+        merged.apply(log)
+        self.assertFalse('user' in log)
+        log = {'raw' : u"LOGIN FROM bob"}
+        merged.apply(log)
+        self.assertEqual(log['user'], u"bob")
+        log = {'raw' : u"Logout by bob"}
+        merged.apply(log)
+        self.assertEqual(log['user'], u"bob")
+
+class TestMatchPath(unittest.TestCase):
+    """Unit tests for the tagging of matched logs"""
+
+    normalizer_path = os.environ['NORMALIZERS_PATH']
+
+    def get_normalizer(self, name):
+        n = parse(open(os.path.join(self.normalizer_path, name)))
+        return Normalizer(n, os.path.join(self.normalizer_path, 'common_tagTypes.xml'),
+                             os.path.join(self.normalizer_path, 'common_callBacks.xml'))
+
+    def test_00_branches(self):
+        """Testing the mapping of groups to patterns"""
+        # some patterns of this normalizer hold groups of their own
+        normalizer = self.get_normalizer('eventlog_security_audit_windows2008_en_3.xml')
+        self.assertEqual(len(normalizer.branches), len(normalizer.patterns))
+        self.assertEqual(normalizer.branch_starts, sorted(normalizer.branch_starts))
+        for pattern, tags, temp_tags, has_callbacks in normalizer.branches:
+            for index, tag in tags:
+                self.assertTrue(tag is pattern.tags[tag.name])
+        self.assertTrue(normalizer.validate())
+
+    def test_10_failing_callback(self):
+        """Testing that a failing callback leaves the log untouched"""
+        normalizer = self.get_normalizer('xferlog.xml')
+        # the tags written, deleted or overwritten before the failure are
+        # restored
+        normalizer.callbacks['decode_direction'] = CallbackFunction("log['uuid'] = 'abc'\n"
+                                                                    "del log['extra']\n"
+                                                                    "log.update({'new' : 1})\n"
+                                                                    "raise Exception('boom')",
+                                                                    'decode_direction')
+        for pattern in normalizer.patterns.values():
+            for tag in pattern.tags.values():
+                tag.resolve_callbacks(normalizer.callbacks, normalizer.genericCallBacks)
+        log = {'raw' : u"Thu Mar 4 08:12:30 2004 1 202.114.40.242 37 /incoming/index.html a _ o a guest@my.net ftp 0 * c",
+               'uuid' : 'xyz', 'extra' : 'x'}
+        backup = dict(log)
+        self.assertRaises(Exception, normalizer.normalize, log)
+        self.assertEqual(log, backup)
+
+
 if __name__ == "__main__":
     unittest.main()
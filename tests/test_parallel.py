@@ -0,0 +1,109 @@
+# -*- python -*-
+
+# pylogsparser - Logs parsers python library
+#
+# Copyright (C) 2011 Wallix Inc.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+#
+
+import os
+import time
+import signal
+import threading
+import unittest
+from logsparser.lognormalizer import LogNormalizer
+
+class Test(unittest.TestCase):
+    """Unit tests for logsparser.parallel"""
+    normalizer_path = os.environ['NORMALIZERS_PATH']
+    lines = [u"Jul 18 15:35:01 zoo /USR/SBIN/CRON[%i]: (root) CMD (/srv/git/redmine-changesets.sh)" % i
+             for i in range(200)]
+
+    def setUp(self):
+        self.ln = LogNormalizer(self.normalizer_path)
+        self.pln = self.ln.parallel(workers = 2, chunksize = 16)
+
+    def tearDown(self):
+        self.pln.close()
+
+    def get_logs(self):
+        return [ {'raw' : line} for line in self.lines ]
+
+    def test_00_ordered(self):
+        """Verify that logs are normalized as by LogNormalizer, in order"""
+        logs = list(self.pln.normalize_batch(self.get_logs()))
+        expected = list(self.ln.normalize_batch(self.get_logs()))
+        self.assertEqual(len(logs), len(expected))
+        for log, e in zip(logs, expected):
+            del log['uuid'], e['uuid']
+            self.assertEqual(log, e)
+        self.assertEqual(self.pln.pending, {})
+
+    def test_10_unordered(self):
+        """Verify that no log is lost when order is not kept"""
+        logs = list(self.pln.normalize_batch(self.get_logs(), ordered = False))
+        self.assertEqual(sorted([ log['pid'] for log in logs ]),
+                         sorted([ str(i) for i in range(200) ]))
+        self.assertEqual(self.pln.lognormalize({'raw' : self.lines[0]})['program'],
+                         '/USR/SBIN/CRON')
+
+    def test_20_worker_crash(self):
+        """Verify that dead workers are replaced, as soon as they die"""
+        # not noticed by polling
+        self.pln.POLL_INTERVAL = 60
+        process = self.pln.workers[0][0]
+        os.kill(process.pid, signal.SIGKILL)
+        process.join()
+        start = time.time()
+        logs = list(self.pln.normalize_batch(self.get_logs()))
+        self.assertTrue(time.time() - start < 30)
+        self.assertEqual([ log['pid'] for log in logs ],
+                         [ str(i) for i in range(200) ])
+        self.assertTrue(self.pln.workers[0][0].is_alive())
+        self.assertTrue(self.pln.workers[0][0] is not process)
+
+    def test_21_worker_crash_resources(self):
+        """Verify that replacing workers does not leak threads nor files"""
+        def resources():
+            fds = None
+            if os.path.isdir('/proc/self/fd'):
+                fds = len(os.listdir('/proc/self/fd'))
+            return threading.active_count(), fds
+        list(self.pln.normalize_batch(self.get_logs()))
+        before = resources()
+        # kept, so that their resources are not released by garbage collection
+        replaced = []
+        for i in range(3):
+            replaced.append(self.pln.workers[0])
+            process = self.pln.workers[0][0]
+            os.kill(process.pid, signal.SIGKILL)
+            process.join()
+            logs = list(self.pln.normalize_batch(self.get_logs()))
+            self.assertEqual(len(logs), 200)
+        self.assertEqual(resources(), before)
+
+    def test_30_reload(self):
+        """Verify that activation changes are applied by every worker"""
+        active = self.pln.get_active_normalizers()
+        active['syslog-1.0'] = False
+        self.pln.set_active_normalizers(active)
+        self.pln.reload()
+        logs = list(self.pln.normalize_batch(self.get_logs()))
+        self.assertEqual(len(logs), 200)
+        self.assertFalse([ log for log in logs if 'program' in log ])
+
+if __name__ == "__main__":
+    unittest.main()
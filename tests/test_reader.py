@@ -0,0 +1,145 @@
+# -*- python -*-
+
+# pylogsparser - Logs parsers python library
+#
+# Copyright (C) 2011 Wallix Inc.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+#
+
+import os
+import sys
+import gzip
+import bz2
+import shutil
+import tempfile
+import threading
+import unittest
+from StringIO import StringIO
+from logsparser.lognormalizer import LogNormalizer
+from logsparser.reader import open_log, read_lines, normalize_file, lzma
+
+class Test(unittest.TestCase):
+    """Unit tests for logsparser.reader"""
+    normalizer_path = os.environ['NORMALIZERS_PATH']
+    content = ("Jul 18 08:55:35 naruto sshd[3245]: Accepted password for bob from 10.0.0.1 port 4242 ssh2\r\n"
+               "\n"
+               "Jul 18 08:55:36 naruto app[3246]: d\xc3\xa9marrage\n"
+               "Jul 18 08:55:37 naruto app[3247]: invalid \xff byte")
+    lines = [u"Jul 18 08:55:35 naruto sshd[3245]: Accepted password for bob from 10.0.0.1 port 4242 ssh2",
+             u"",
+             u"Jul 18 08:55:36 naruto app[3246]: d\xe9marrage",
+             u"Jul 18 08:55:37 naruto app[3247]: invalid \ufffd byte"]
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, name, opener):
+        path = os.path.join(self.tmpdir, name)
+        f = opener(path, 'wb')
+        f.write(self.content)
+        f.close()
+        return path
+
+    def test_00_read_lines(self):
+        """Verify that lines are split and decoded across blocks"""
+        for bufsize in (1, 2, 7, 64, 1 << 20):
+            self.assertEqual(list(read_lines(StringIO(self.content), bufsize = bufsize)),
+                             self.lines)
+        self.assertEqual(list(read_lines(StringIO(self.content), encoding = None))[2],
+                         "Jul 18 08:55:36 naruto app[3246]: d\xc3\xa9marrage")
+        self.assertEqual(list(read_lines(StringIO(""))), [])
+        self.assertEqual(list(read_lines(StringIO("a\n\nb\n"))), [u"a", u"", u"b"])
+        # a line spanning many blocks
+        long_line = "x" * 100000
+        self.assertEqual(list(read_lines(StringIO("a\n" + long_line + "\nb"), bufsize = 3)),
+                         [u"a", long_line, u"b"])
+        self.assertEqual(list(read_lines(StringIO("a\n" + long_line), bufsize = 3)),
+                         [u"a", long_line])
+
+    def test_10_compressed(self):
+        """Verify that compressed files are read transparently"""
+        openers = [('plain.log', open), ('log.gz', gzip.open), ('log.bz2', bz2.BZ2File)]
+        if lzma is not None:
+            openers.append(('log.xz', lzma.LZMAFile))
+        for name, opener in openers:
+            f = open_log(self.write(name, opener))
+            self.assertEqual(list(read_lines(f, bufsize = 16)), self.lines)
+            f.close()
+
+    def compressed(self):
+        """@return: the content, gzipped"""
+        path = self.write('content.gz', gzip.open)
+        data = open(path, 'rb').read()
+        os.unlink(path)
+        return data
+
+    def test_11_compressed_streams(self):
+        """Verify that compressed streams are read without seeking them"""
+        data = self.compressed()
+        # a file object, holding two gzip members
+        f = open_log(StringIO(data + data))
+        self.assertEqual(list(read_lines(f, bufsize = 16)), self.lines[:-1] +
+                         [self.lines[-1] + self.lines[0]] + self.lines[1:])
+        f = StringIO(bz2.compress(self.content))
+        self.assertEqual(list(read_lines(open_log(f), bufsize = 16)), self.lines)
+        self.assertFalse(f.closed)
+        # the standard input
+        path = os.path.join(self.tmpdir, 'stdin')
+        open(path, 'wb').write(data)
+        stdin = sys.stdin
+        sys.stdin = open(path, 'rb')
+        try:
+            f = open_log('-')
+            self.assertEqual(list(read_lines(f)), self.lines)
+            f.close()
+            self.assertFalse(sys.stdin.closed)
+        finally:
+            sys.stdin.close()
+            sys.stdin = stdin
+        # a named pipe, as given by a shell process substitution
+        path = os.path.join(self.tmpdir, 'fifo')
+        os.mkfifo(path)
+        def feed():
+            fifo = open(path, 'wb')
+            fifo.write(data)
+            fifo.close()
+        writer = threading.Thread(target = feed)
+        writer.start()
+        try:
+            f = open_log(path)
+            self.assertEqual(list(read_lines(f, bufsize = 16)), self.lines)
+            f.close()
+        finally:
+            writer.join()
+
+    def test_20_normalize_file(self):
+        """Verify that the logs of a file are normalized lazily"""
+        ln = LogNormalizer(self.normalizer_path)
+        path = self.write('log.gz', gzip.open)
+        logs = list(normalize_file(ln, path))
+        self.assertEqual([ log['raw'] for log in logs ],
+                         [ l for l in self.lines if l ])
+        self.assertEqual(logs[0]['user'], 'bob')
+        self.assertEqual(logs[1]['body'], u"d\xe9marrage")
+        logs = normalize_file(ln, StringIO(self.content), skip_empty = False)
+        self.assertEqual(logs.next()['program'], 'sshd')
+        self.assertEqual(logs.next()['raw'], u"")
+
+if __name__ == "__main__":
+    unittest.main()
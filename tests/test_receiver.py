@@ -0,0 +1,158 @@
+# -*- python -*-
+
+# pylogsparser - Logs parsers python library
+#
+# Copyright (C) 2011 Wallix Inc.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+#
+
+import os
+import time
+import socket
+import unittest
+import threading
+from logsparser.lognormalizer import LogNormalizer
+from logsparser.receiver import SyslogReceiver, split_frames
+
+class Test(unittest.TestCase):
+    """Unit tests for logsparser.receiver"""
+    normalizer_path = os.environ['NORMALIZERS_PATH']
+    message = "<29>Jul 18 08:55:35 naruto dhclient[%i]: bound to 10.10.4.11 -- renewal in 2792 seconds."
+
+    def setUp(self):
+        self.logs = []
+        self.lock = threading.Lock()
+        self.receiver = None
+
+    def tearDown(self):
+        if self.receiver is not None:
+            self.receiver.stop()
+
+    def sink(self, logs):
+        self.lock.acquire()
+        try:
+            self.logs.extend(logs)
+        finally:
+            self.lock.release()
+
+    def start(self, **kwargs):
+        self.receiver = SyslogReceiver(LogNormalizer(self.normalizer_path),
+                                       kwargs.pop('sink', self.sink),
+                                       udp = ('127.0.0.1', 0),
+                                       tcp = ('127.0.0.1', 0),
+                                       **kwargs)
+        self.receiver.start()
+
+    def wait(self, count, timeout = 10):
+        end = time.time() + timeout
+        while len(self.logs) < count and time.time() < end:
+            time.sleep(0.01)
+        self.assertEqual(len(self.logs), count)
+
+    def pids(self):
+        return sorted([ int(log['pid']) for log in self.logs ])
+
+    def test_00_split_frames(self):
+        """Verify that both RFC 6587 framings are split"""
+        self.assertEqual(split_frames("5 hello11 hello\nworld<13>a\n<13>b\r\n<13>c"),
+                         (["hello", "hello\nworld", "<13>a", "<13>b\r"], "<13>c"))
+        self.assertEqual(split_frames("12 <13>incomp"), ([], "12 <13>incomp"))
+        self.assertEqual(split_frames("2013-11-05 is not a length\n"),
+                         (["2013-11-05 is not a length"], ""))
+        self.assertEqual(split_frames("x" * 20, max_message = 10), (["x" * 20], ""))
+        # oversized frames are not waited for
+        self.assertEqual(split_frames("999999999 <13>a\n", max_message = 10),
+                         (["999999999 <13>a"], ""))
+        self.assertEqual(split_frames("999999999 " + "x" * 20, max_message = 10),
+                         (["999999999 " + "x" * 20], ""))
+        self.assertEqual(split_frames("10 <13>abcdef", max_message = 10),
+                         (["<13>abcdef"], ""))
+
+    def test_10_udp(self):
+        """Verify that datagrams are normalized"""
+        self.start(batch_size = 16, batch_delay = 0.05)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for i in range(100):
+            sock.sendto(self.message % i + "\n", self.receiver.udp_address)
+        sock.close()
+        self.wait(100)
+        self.assertEqual(self.pids(), range(100))
+        self.assertEqual(self.logs[0]['program'], 'dhclient')
+        self.assertEqual(self.logs[0]['body'], 'bound to 10.10.4.11 -- renewal in 2792 seconds.')
+        self.assertEqual(self.receiver.dropped, 0)
+
+    def test_20_tcp(self):
+        """Verify that TCP messages are normalized, whatever their framing"""
+        self.start(batch_size = 16, batch_delay = 0.05, workers = 2)
+        sock = socket.create_connection(self.receiver.tcp_address)
+        data = ""
+        for i in range(50):
+            message = self.message % i
+            if i % 2:
+                data += "%i %s" % (len(message), message)
+            else:
+                data += message + "\n"
+        # split in odd places
+        for i in range(0, len(data), 333):
+            sock.sendall(data[i:i + 333])
+        sock.sendall(self.message % 50)
+        sock.close()
+        self.wait(51)
+        self.assertEqual(self.pids(), range(51))
+
+    def test_30_backpressure(self):
+        """Verify that TCP connections are not read while the sink is busy"""
+        release = threading.Event()
+        def sink(logs):
+            release.wait()
+            self.sink(logs)
+        self.start(sink = sink, batch_size = 4, batch_delay = 0.05, max_batches = 1)
+        sock = socket.create_connection(self.receiver.tcp_address)
+        # more than the receiver reads at once
+        data = "".join([ self.message % i + "\n" for i in range(5000) ])
+        sender = threading.Thread(target = sock.sendall, args = (data,))
+        sender.start()
+        end = time.time() + 10
+        while not self.receiver.paused and time.time() < end:
+            time.sleep(0.01)
+        try:
+            self.assertTrue(self.receiver.paused)
+            self.assertTrue(self.receiver.received < 5000)
+        finally:
+            release.set()
+        sender.join()
+        sock.close()
+        self.wait(5000, timeout = 60)
+        self.assertEqual(self.pids(), range(5000))
+        self.assertEqual(self.receiver.dropped, 0)
+
+    def test_40_stop(self):
+        """Verify that buffered messages are normalized on stop"""
+        self.start(batch_size = 1000, batch_delay = 60)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for i in range(10):
+            sock.sendto(self.message % i, self.receiver.udp_address)
+        sock.close()
+        end = time.time() + 10
+        while self.receiver.received < 10 and time.time() < end:
+            time.sleep(0.01)
+        self.assertEqual(self.logs, [])
+        self.receiver.stop()
+        self.assertEqual(self.pids(), range(10))
+        self.assertRaises(ValueError, SyslogReceiver, None, self.sink)
+
+if __name__ == "__main__":
+    unittest.main()
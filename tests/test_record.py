@@ -0,0 +1,144 @@
+# -*- python -*-
+
+# pylogsparser - Logs parsers python library
+#
+# Copyright (C) 2011 Wallix Inc.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation; either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+#
+
+import os
+import sys
+import pickle
+import unittest
+from logsparser.lognormalizer import LogNormalizer
+from logsparser import record
+from logsparser.record import Record
+
+class Test(unittest.TestCase):
+    """Unit tests for logsparser.record"""
+    normalizer_path = os.environ['NORMALIZERS_PATH']
+    lines = [u"Jul 18 08:55:35 naruto sshd[3245]: Accepted password for bob from 10.0.0.1 port 4242 ssh2",
+             u"Jul 18 15:35:01 zoo /USR/SBIN/CRON[14338]: (root) CMD (/srv/git/redmine-changesets.sh)",
+             u"nothing to see here"]
+
+    def test_00_mapping(self):
+        """Verify that records behave like dictionaries"""
+        r = Record({'raw' : 'a', 'body' : 'b'}, program = 'p')
+        self.assertEqual(r, {'raw' : 'a', 'body' : 'b', 'program' : 'p'})
+        self.assertEqual(len(r), 3)
+        self.assertTrue('body' in r and r.has_key('raw'))
+        self.assertFalse('pid' in r)
+        self.assertEqual(r['body'], 'b')
+        self.assertRaises(KeyError, r.__getitem__, 'pid')
+        self.assertEqual(r.get('pid', 0), 0)
+        r['body'] = 'c'
+        r['pid'] = '1'
+        del r['raw']
+        self.assertRaises(KeyError, r.__delitem__, 'raw')
+        self.assertEqual(sorted(r.keys()), ['body', 'pid', 'program'])
+        self.assertEqual(sorted(r.items()), sorted(dict(r).items()))
+        self.assertEqual(r.pop('pid'), '1')
+        self.assertEqual(r.pop('pid', None), None)
+        self.assertEqual(r.setdefault('body', 'd'), 'c')
+        self.assertEqual(r.setdefault('source', 's'), 's')
+        r.update([('action', 'x')])
+        self.assertEqual(r, {'body' : 'c', 'program' : 'p', 'source' : 's', 'action' : 'x'})
+        self.assertNotEqual(r, {})
+        c = r.copy()
+        c['body'] = 'e'
+        self.assertEqual(r['body'], 'c')
+        self.assertEqual(pickle.loads(pickle.dumps(r, 2)), r)
+        r.clear()
+        self.assertEqual(len(r), 0)
+
+    def test_10_shared_schema(self):
+        """Verify that records with the same tags share their schema"""
+        a = Record(raw = 'a')
+        b = Record([('raw', 'b')])
+        a['pid'] = b['pid'] = '1'
+        self.assertTrue(a._schema is b._schema)
+        c = Record({'raw' : 'c', 'pid' : '2'})
+        d = Record({'raw' : 'd', 'pid' : '3'})
+        self.assertTrue(c._schema is d._schema)
+        del a['pid']
+        self.assertTrue(a._schema is Record(raw = 'e')._schema)
+
+    def test_20_normalize(self):
+        """Verify that records are normalized as dictionaries are"""
+        ln = LogNormalizer(self.normalizer_path)
+        expected = list(ln.normalize_batch([ {'raw' : l} for l in self.lines ]))
+        for e in expected:
+            del e['uuid']
+        compact = list(ln.normalize_batch([ {'raw' : l} for l in self.lines ],
+                                          compact = True))
+        records = list(ln.normalize_batch([ Record(raw = l) for l in self.lines ]))
+        for logs in (compact, records):
+            for log, e in zip(logs, expected):
+                self.assertTrue(isinstance(log, Record))
+                del log['uuid']
+                self.assertEqual(log, e)
+        self.assertEqual(compact[0]['user'], 'bob')
+        self.assertEqual(records[1]['program'], '/USR/SBIN/CRON')
+
+    def test_30_parallel(self):
+        """Verify that records are returned by the worker processes"""
+        ln = LogNormalizer(self.normalizer_path)
+        pln = ln.parallel(workers = 2, chunksize = 2)
+        try:
+            logs = list(pln.normalize_batch([ {'raw' : l} for l in self.lines ],
+                                            compact = True))
+        finally:
+            pln.close()
+        expected = list(ln.normalize_batch([ {'raw' : l} for l in self.lines ]))
+        self.assertEqual(len(logs), len(expected))
+        for log, e in zip(logs, expected):
+            self.assertTrue(isinstance(log, Record))
+            del log['uuid'], e['uuid']
+            self.assertEqual(log, e)
+        # unpickled records share their schemas again
+        a, b = pickle.loads(pickle.dumps([Record(raw = 'a'), Record(raw = 'b')], 2))
+        self.assertTrue(a._schema is b._schema is Record(raw = 'c')._schema)
+
+    def test_40_bounded_schemas(self):
+        """Verify that schemas are still shared past MAX_SCHEMAS"""
+        ln = LogNormalizer(self.normalizer_path)
+        max_schemas = record.MAX_SCHEMAS
+        record.MAX_SCHEMAS = 16
+        try:
+            logs = [ Record({'raw' : 'r', 'tag%i' % i : i}) for i in range(100) ]
+            for i, log in enumerate(logs):
+                self.assertEqual(log['tag%i' % i], i)
+                log['pid'] = '1'
+                del log['tag%i' % i]
+                self.assertEqual(log, {'raw' : 'r', 'pid' : '1'})
+                self.assertTrue(len(record._schemas) <= record.MAX_SCHEMAS)
+            self.assertTrue(record._schemas[()] is record.EMPTY)
+            # records with the same tags share one schema again, and take
+            # much less room than dictionaries
+            lines = [ self.lines[0] ] * 100
+            logs = list(ln.normalize_batch([ {'raw' : l} for l in lines ],
+                                           compact = True))
+            self.assertEqual(len(set([ id(log._schema) for log in logs ])), 1)
+            expected = list(ln.normalize_batch([ {'raw' : lines[0]} ]))[0]
+            self.assertEqual(len(logs[0]), len(expected))
+            for log in logs:
+                size = sys.getsizeof(log) + sys.getsizeof(log._values)
+                self.assertTrue(3 * size < sys.getsizeof(expected))
+        finally:
+            record.MAX_SCHEMAS = max_schemas
+
+if __name__ == "__main__":
+    unittest.main()
@@ -32,12 +32,22 @@ import test_lognormalizer
 import test_log_samples
 import test_commonElements
 import test_extras
+import test_parallel
+import test_reader
+import test_cli
+import test_receiver
+import test_record
 
 tests = (test_commonElements,
          test_normalizer,
          test_lognormalizer,
          test_log_samples,
          test_extras,
+         test_parallel,
+         test_reader,
+         test_cli,
+         test_receiver,
+         test_record,
          )
 
 load = unittest.defaultTestLoader.loadTestsFromModule
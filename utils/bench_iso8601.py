@@ -0,0 +1,66 @@
+# -*- python -*-
+#
+# bench_iso8601.py
+#
+# This program is part of pylogsparser, a logs parser python library, copyright (c) 2011 Wallix Inc.
+#
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 as published by the
+# Free Software Foundation
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+#
+#
+# Description
+# ===========
+# This program compares the ISO 8601 parser of logsparser.extras with the
+# dateutil based implementation it replaces.
+# - every date is distinct in the "distinct" run, so that the parser's cache
+#   never hits; the "repeated" run parses the same date over and over.
+# - default iterations number is 20000 (see "iterations" variable)
+# - times are in micro-seconds per date
+#
+
+import timeit
+from datetime import datetime, timedelta
+import dateutil.parser as dp
+from logsparser.extras import iso_to_utc
+
+"""Measuring ISO 8601 dates parsing time"""
+
+iterations = 20000
+start = datetime(2012, 12, 21, 7, 49, 2, 123456)
+formats = ("%Y-%m-%dT%H:%M:%SZ",
+           "%Y-%m-%dT%H:%M:%S.%f+01:00",
+           "%Y-%m-%d %H:%M:%S")
+
+def dateutil_to_utc(date):
+    """the former implementation"""
+    parsed = dp.parse(date)
+    if parsed.tzinfo is not None:
+        parsed = (parsed - parsed.utcoffset()).replace(tzinfo = None)
+    return parsed
+
+def bench(function, dates):
+    t = timeit.Timer(lambda: [ function(d) for d in dates ])
+    return t.timeit(1) / len(dates) * 1000000
+
+if __name__ == "__main__":
+    print "%-32s %12s %12s %12s" % ("format", "dateutil", "distinct", "repeated")
+    for fmt in formats:
+        dates = [ (start + timedelta(seconds = i)).strftime(fmt)
+                  for i in xrange(iterations) ]
+        for d in dates[:100]:
+            assert iso_to_utc(d) == dateutil_to_utc(d)
+        iso_to_utc.cache.clear()
+        print "%-32s %10.2f us %10.2f us %10.2f us" % (fmt,
+                                                      bench(dateutil_to_utc, dates),
+                                                      bench(iso_to_utc, dates),
+                                                      bench(iso_to_utc, [dates[0]] * iterations))
@@ -28,6 +28,7 @@ import time
 import os
 from sys import exit as sysexit
 from logsparser.lognormalizer import LogNormalizer as LN
+from logsparser.reader import open_log, read_lines
 from optparse import OptionParser
 
 normalizer_path = os.environ['NORMALIZERS_PATH'] or '../normalizers/'
@@ -72,10 +73,11 @@ logs = []
 
 if options.input:
     try:
-        logs = open(options.input, 'r').readlines()
+        # the file is read as the logs are parsed
+        logs = ( l for l in read_lines(open_log(options.input)) if l )
     except IOError, e:
         print "Could not open %s, skipping" % options.input
-if not logs:
+else:
     print "Using default logs only."
     
 categories = dict([ (u.taxonomy, 0) 
@@ -94,7 +96,9 @@ logs_per_categories = {}
 
 def compute(logs_set):
     global logs_per_categories
+    count = 0
     for l in logs_set:
+        count += 1
         testlog = {'raw' : l,
                    'body': l}
         ln.lognormalize(testlog)
@@ -114,12 +118,12 @@ def compute(logs_set):
                 logs_per_categories[taxonomy]['tags'][t][prg] = 0
             logs_per_categories[taxonomy]['tags'][t]['_total'] += 1
             logs_per_categories[taxonomy]['tags'][t][prg] += 1
+    return count
 
-print "Parsing %i logs..." % (len(base_logs) + len(logs)),
+print "Parsing logs...",
 start = time.time()
-compute(base_logs)
-compute(logs)
-print "Done in %.2f seconds." % (time.time() - start)
+count = compute(base_logs) + compute(logs)
+print "%i logs done in %.2f seconds." % (count, time.time() - start)
 print "\n-------------------\n"
 
 for c in categories: